@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .services import shared_cache
+
+
+@register(Tags.caches)
+def check_page_cache_backend(app_configs, **kwargs):
+    if settings.PAGE_CACHE_ENABLED and not shared_cache():
+        return [
+            Error(
+                "PAGE_CACHE_ENABLED requires a CACHES backend shared by every process.",
+                hint=(
+                    "Cached pages are retired by version bumps that workers and management commands "
+                    "make as well; with a per-process cache those bumps are lost. Point "
+                    "DJANGO_CACHE_BACKEND at Redis, memcached or the database cache, or unset "
+                    "PAGE_CACHE_ENABLED."
+                ),
+                id="portal.E001",
+            )
+        ]
+    return []
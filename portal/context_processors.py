@@ -0,0 +1,6 @@
+from django.conf import settings
+
+
+def site_settings(request):
+    """Expose deployment-level display settings to every template."""
+    return {"VIDEO_EMBED_MODE": settings.VIDEO_EMBED_MODE}
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from django import forms
+from django.conf import settings
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 
 from .models import AccountUser, ChatMessage, ChatTask, ChatTaskItem, Media, Post, Video
@@ -74,6 +75,13 @@ class PostForm(forms.ModelForm):
             "content": "Post Content (Markdown/HTML)",
         }
 
+    def clean_content(self) -> str:
+        content = self.cleaned_data["content"]
+        limit = settings.POST_CONTENT_MAX_LENGTH
+        if len(content) > limit:
+            raise forms.ValidationError(f"Post content is limited to {limit:,} characters ({len(content):,} given).")
+        return content
+
 
 class MediaFilterForm(forms.Form):
     MEDIA_TYPE_CHOICES = [
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import traceback
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from . import services
+from .models import Job, Post
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+
+HANDLERS: dict[str, Callable[..., None]] = {}
+
+
+def handler(kind: str) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    """Register a function as the handler for jobs of ``kind``."""
+    def register(function: Callable[..., None]) -> Callable[..., None]:
+        HANDLERS[kind] = function
+        return function
+    return register
+
+
+def enqueue(kind: str, key: str, **payload) -> Job | None:
+    """Queue a job under the idempotency ``key``, or run it right away when JOBS_RUN_INLINE is set.
+
+    A key that is already pending or running is not queued twice; a key whose
+    job already finished is queued again.
+    """
+    if settings.JOBS_RUN_INLINE:
+        HANDLERS[kind](**payload)
+        return None
+    job, created = Job.objects.get_or_create(key=key, defaults={"kind": kind, "payload": payload})
+    if not created and job.status in (Job.Status.DONE, Job.Status.FAILED):
+        Job.objects.filter(pk=job.pk, status=job.status).update(
+            status=Job.Status.PENDING, payload=payload, attempts=0, last_error="", started_at=None, finished_at=None
+        )
+    return job
+
+
+def claim(limit: int) -> list[Job]:
+    """Move up to ``limit`` pending jobs to running; concurrent workers never claim the same job."""
+    now = timezone.now()
+    claimed = []
+    for pk in Job.objects.filter(status=Job.Status.PENDING).values_list("pk", flat=True)[:limit]:
+        updated = Job.objects.filter(pk=pk, status=Job.Status.PENDING).update(
+            status=Job.Status.RUNNING, started_at=now, attempts=F("attempts") + 1
+        )
+        if updated:
+            claimed.append(pk)
+    return list(Job.objects.filter(pk__in=claimed))
+
+
+def run(job: Job) -> bool:
+    """Run a claimed job and record the outcome; failures are retried up to MAX_ATTEMPTS."""
+    try:
+        HANDLERS[job.kind](**job.payload)
+    except Exception:
+        logger.exception("Job %s (%s) failed", job.pk, job.kind)
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.FAILED if job.attempts >= MAX_ATTEMPTS else Job.Status.PENDING,
+            last_error=traceback.format_exc(),
+            finished_at=timezone.now(),
+        )
+        return False
+    Job.objects.filter(pk=job.pk).update(status=Job.Status.DONE, last_error="", finished_at=timezone.now())
+    return True
+
+
+def requeue_stale(older_than: timedelta) -> int:
+    """Return jobs left running by a worker that died back to the queue."""
+    return Job.objects.filter(status=Job.Status.RUNNING, started_at__lt=timezone.now() - older_than).update(
+        status=Job.Status.PENDING
+    )
+
+
+# ── Post derivations ─────────────────────────────────────────────────────────
+
+def post_version(post: Post) -> str:
+    """Digest of the fields the derivations read; one derivation job per version."""
+    source = "\x00".join((post.content, post.thumbnail, post.title))
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:32]
+
+
+def enqueue_post_derivation(post: Post) -> Job | None:
+    version = post_version(post)
+    return enqueue("derive_post", f"derive_post:{post.pk}:{version}", post_id=post.pk, version=version)
+
+
+@handler("derive_post")
+def derive_post(post_id: int, version: str) -> None:
+    """Fill the excerpt and stored HTML of a post saved with ``derive=False`` and sync its media."""
+    post = Post.objects.filter(pk=post_id).first()
+    if post is None or post_version(post) != version:
+        # Deleted, or edited again since; the newer version has its own job.
+        return
+    fields = post.derive_content_fields()
+    if fields:
+        post.save(update_fields=fields, derive=False)
+    services.sync_post_media(post)
+
+
+# ── Maintenance ──────────────────────────────────────────────────────────────
+
+def enqueue_media_gc() -> Job | None:
+    return enqueue("collect_orphaned_media", "collect_orphaned_media")
+
+
+@handler("collect_orphaned_media")
+def collect_orphaned_media(batch_size: int = 500) -> None:
+    """Delete media rows no post references any more; see ``manage.py gc_media``."""
+    deleted = services.delete_orphaned_media(batch_size=batch_size)
+    if deleted:
+        logger.info("Deleted %s orphaned media rows", deleted)
+
+
+__all__ = [
+    "HANDLERS",
+    "claim",
+    "enqueue",
+    "enqueue_media_gc",
+    "enqueue_post_derivation",
+    "handler",
+    "post_version",
+    "requeue_stale",
+    "run",
+]
@@ -0,0 +1,35 @@
+"""Helpers shared by the bulk post-processing commands (rerender_posts, rebuild_media)."""
+
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import CommandError
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Checkpoint:
+    """Last processed post id, persisted to a file so an interrupted run can resume."""
+
+    def __init__(self, path: str | None) -> None:
+        self.path = Path(path) if path else None
+
+    def load(self) -> int:
+        if not self.path or not self.path.exists():
+            return 0
+        try:
+            return int(self.path.read_text().strip() or 0)
+        except ValueError:
+            raise CommandError(f"Checkpoint {self.path} does not contain a post id.")
+
+    def save(self, last_id: int) -> None:
+        if self.path:
+            self.path.write_text(str(last_id))
+
+    def clear(self) -> None:
+        if self.path and self.path.exists():
+            self.path.unlink()
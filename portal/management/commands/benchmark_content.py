@@ -0,0 +1,247 @@
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from portal import markup
+from portal.models import Post
+from portal.services import extract_media_from_content, render_post_content
+from portal.signals import cache_versions_frozen
+
+WORDS = (
+    "union student council budget event hall meeting vote report committee sports arts "
+    "volunteer schedule announcement library campus club week term members update plan"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(6, 16))
+    if rng.random() < 0.3:
+        index = rng.randrange(len(words))
+        words[index] = rng.choice(("**{}**", "*{}*", "__{}__", "`{}`")).format(words[index])
+    if rng.random() < 0.15:
+        words.append(f"[details](https://example.com/{rng.choice(WORDS)})")
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(2, 6)))
+
+
+def _short(rng: random.Random) -> str:
+    return f"# {_sentence(rng)}\n\n{_paragraph(rng)}"
+
+
+def _long(rng: random.Random) -> str:
+    sections = []
+    for _ in range(20):
+        sections.append(f"## {_sentence(rng)}")
+        sections.extend(_paragraph(rng) for _ in range(rng.randint(2, 4)))
+    return "\n\n".join(sections)
+
+
+def _code_heavy(rng: random.Random) -> str:
+    parts = []
+    for index in range(12):
+        parts.append(_paragraph(rng))
+        body = "\n".join(f"    value_{index}_{line} = compute({line}) * 2" for line in range(rng.randint(4, 20)))
+        parts.append(f"```python\ndef step_{index}():\n{body}\n```")
+    return "\n\n".join(parts)
+
+
+def _media_heavy(rng: random.Random) -> str:
+    parts = []
+    for index in range(30):
+        kind = rng.randrange(4)
+        if kind == 0:
+            parts.append(f"![{rng.choice(WORDS)}](https://cdn.example.com/img/{index}.jpg)")
+        elif kind == 1:
+            parts.append(f'<img src="https://cdn.example.com/raw/{index}.png" alt="">')
+        elif kind == 2:
+            parts.append(f"https://youtu.be/vid{index:08d}")
+        else:
+            parts.append(f"[video](https://media.example.com/clip/{index}.mp4)")
+        parts.append(_sentence(rng))
+    return "\n\n".join(parts)
+
+
+def _list_heavy(rng: random.Random) -> str:
+    parts = []
+    for _ in range(10):
+        parts.append(f"### {_sentence(rng)}")
+        parts.append("\n".join(f"- {_sentence(rng)}" for _ in range(rng.randint(3, 10))))
+        parts.append("\n".join(f"{number}. {_sentence(rng)}" for number in range(1, rng.randint(3, 8))))
+        parts.append("\n".join(f"> {_sentence(rng)}" for _ in range(rng.randint(1, 4))))
+    return "\n\n".join(parts)
+
+
+PROFILES = {
+    "short": _short,
+    "long": _long,
+    "code": _code_heavy,
+    "media": _media_heavy,
+    "lists": _list_heavy,
+}
+
+
+def build_corpus(seed: int, posts_per_profile: int) -> dict[str, list[str]]:
+    """Deterministic synthetic posts per profile; the same seed always yields the same corpus."""
+    corpus = {}
+    for offset, (name, generate) in enumerate(PROFILES.items()):
+        rng = random.Random(seed * 1000 + offset)
+        corpus[name] = [generate(rng) for _ in range(posts_per_profile)]
+    return corpus
+
+
+def _save_post(content: str) -> None:
+    with transaction.atomic():
+        Post(title="Benchmark post", content=content).save()
+        transaction.set_rollback(True)
+
+
+FUNCTIONS = {
+    "render_post_content": render_post_content,
+    "extract_media_from_content": extract_media_from_content,
+    "analyze": markup.analyze,
+    "Post.save": _save_post,
+}
+
+
+def _measure(function, documents: list[str], repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        for document in documents:
+            started = time.perf_counter()
+            function(document)
+            timings.append(time.perf_counter() - started)
+
+    # Allocation tracking distorts timings, so it runs as a separate pass.
+    tracemalloc.start()
+    peaks = []
+    for document in documents:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        function(document)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    timings.sort()
+    total = sum(timings)
+    characters = sum(len(document) for document in documents) * repeat
+    return {
+        "calls": len(timings),
+        "ops_per_sec": round(len(timings) / total, 1) if total else None,
+        "chars_per_sec": round(characters / total) if total else None,
+        "p50_ms": round(statistics.median(timings) * 1000, 4),
+        "p99_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000, 4),
+        "peak_alloc_bytes": max(peaks),
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark rendering, media extraction and Post.save over a synthetic corpus and write JSON results."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=29, help="Corpus seed (default: 29).")
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=20,
+            help="Posts generated per profile (default: 20).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed passes over each profile (default: 5).",
+        )
+        parser.add_argument(
+            "--function",
+            action="append",
+            default=[],
+            choices=sorted(FUNCTIONS),
+            help="Only benchmark the named function. May be given more than once.",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            default="benchmark-content.json",
+            help="Where to write the JSON results (default: benchmark-content.json).",
+        )
+        parser.add_argument(
+            "--compare",
+            type=str,
+            help="Earlier results file; fail if any p50 regressed beyond --threshold.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=1.25,
+            help="Allowed p50 slowdown factor against --compare (default: 1.25).",
+        )
+        parser.add_argument("--label", type=str, default="", help="Free-form label stored with the results, e.g. a commit id.")
+
+    def handle(self, *args, **options):
+        if options["posts"] <= 0 or options["repeat"] <= 0:
+            raise CommandError("--posts and --repeat must be positive integers.")
+        baseline = None
+        if options["compare"]:
+            try:
+                baseline = json.loads(Path(options["compare"]).read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Could not read {options['compare']}: {exc}")
+
+        corpus = build_corpus(options["seed"], options["posts"])
+        names = options["function"] or list(FUNCTIONS)
+        results = []
+        # Post.save is rolled back, but its signals would still retire every cached page.
+        with cache_versions_frozen():
+            for name in names:
+                for profile, documents in corpus.items():
+                    result = {"function": name, "profile": profile, **_measure(FUNCTIONS[name], documents, options["repeat"])}
+                    results.append(result)
+                    self.stdout.write(
+                        f"{name:28} {profile:6} {result['ops_per_sec']:>10} ops/s  "
+                        f"p50 {result['p50_ms']:8.3f}ms  p99 {result['p99_ms']:8.3f}ms  "
+                        f"peak {result['peak_alloc_bytes'] / 1024:8.1f} KiB"
+                    )
+
+        report = {
+            "label": options["label"],
+            "seed": options["seed"],
+            "posts_per_profile": options["posts"],
+            "repeat": options["repeat"],
+            "renderer_version": markup.RENDERER_VERSION,
+            "python": platform.python_version(),
+            "results": results,
+        }
+        output = Path(options["output"])
+        output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {output}."))
+
+        if baseline is not None:
+            self._compare(baseline, results, options["threshold"])
+
+    def _compare(self, baseline: dict, results: list[dict], threshold: float) -> None:
+        previous = {(item["function"], item["profile"]): item for item in baseline.get("results", [])}
+        regressions = []
+        for result in results:
+            before = previous.get((result["function"], result["profile"]))
+            if not before or not before.get("p50_ms"):
+                continue
+            ratio = result["p50_ms"] / before["p50_ms"]
+            line = f"{result['function']:28} {result['profile']:6} p50 {before['p50_ms']:.3f}ms -> {result['p50_ms']:.3f}ms  x{ratio:.2f}"
+            if ratio > threshold:
+                regressions.append(line)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+        if regressions:
+            raise CommandError(f"{len(regressions)} benchmarks regressed beyond x{threshold}.")
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
@@ -0,0 +1,94 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portal.markup import analyze, render
+
+# Inputs that trip backtracking or per-line overhead in naive markup renderers.
+ADVERSARIAL_INPUTS = {
+    "stars": lambda n: "*" * n,
+    "underscores": lambda n: "_" * n,
+    "star-word": lambda n: "*a" * (n // 2),
+    "open-brackets": lambda n: "[" * n,
+    "open-images": lambda n: "![" * (n // 2),
+    "open-hrefs": lambda n: "[a](" * (n // 4),
+    "nested-links": lambda n: "[![" * (n // 3),
+    "img-in-link": lambda n: "[![a](b)" * (n // 8),
+    "alt-close": lambda n: "![a]" * (n // 4),
+    "backticks": lambda n: "`" * n,
+    "fence-word": lambda n: "```" + "a" * (n - 3),
+    "fences": lambda n: "```a```\n" * (n // 8),
+    "open-tags": lambda n: "<a" * (n // 2),
+    "youtube": lambda n: "youtu.be/" * (n // 9),
+    "newlines": lambda n: "\n" * n,
+    "bullets": lambda n: "- a\n" * (n // 4),
+    "quotes": lambda n: "> a\n" * (n // 4),
+    "headings": lambda n: "# a\n" * (n // 4),
+}
+
+
+# The preview path renders; saving a post analyzes (render plus excerpt, media and stats).
+STAGES = {"render": render, "analyze": analyze}
+
+
+def _time(stage, content: str) -> float:
+    started = time.perf_counter()
+    stage(content)
+    return time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = "Render and analyze adversarial inputs at the maximum post size and fail if any exceeds the time budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=settings.POST_CONTENT_MAX_LENGTH,
+            help="Input length in characters (default: POST_CONTENT_MAX_LENGTH).",
+        )
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            default=2000.0,
+            help="Maximum render or analyze time per input, in milliseconds (default: 2000).",
+        )
+        parser.add_argument(
+            "--max-ratio",
+            type=float,
+            default=3.0,
+            help="Maximum slowdown when the input size doubles; linear rendering stays near 2 (default: 3).",
+        )
+        parser.add_argument(
+            "--input",
+            action="append",
+            default=[],
+            choices=sorted(ADVERSARIAL_INPUTS),
+            help="Only run the named input. May be given more than once.",
+        )
+
+    def handle(self, *args, **options):
+        size = options["size"]
+        if size < 1000:
+            raise CommandError("--size must be at least 1000.")
+        names = options["input"] or list(ADVERSARIAL_INPUTS)
+
+        failures = []
+        for name in names:
+            generate = ADVERSARIAL_INPUTS[name]
+            for stage_name, stage in STAGES.items():
+                half = _time(stage, generate(size // 2))
+                full = _time(stage, generate(size))
+                # Sub-millisecond timings are noise; only judge scaling above that.
+                ratio = full / half if half >= 0.001 else 1.0
+                line = f"{name:15} {stage_name:8} {half * 1000:9.1f}ms {full * 1000:9.1f}ms  x{ratio:.1f}"
+                if full * 1000 > options["budget_ms"] or ratio > options["max_ratio"]:
+                    failures.append(f"{name} ({stage_name})")
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+
+        if failures:
+            raise CommandError(f"Over budget at {size:,} characters: {', '.join(failures)}.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(names)} inputs rendered and analyzed within budget at {size:,} characters."))
@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portal.markup import analyze
+
+CORPUS_PATH = Path(__file__).resolve().parents[2] / "markup_corpus.json"
+
+
+def _first_difference(expected: str, actual: str) -> int:
+    for index, (left, right) in enumerate(zip(expected, actual)):
+        if left != right:
+            return index
+    return min(len(expected), len(actual))
+
+
+class Command(BaseCommand):
+    help = "Render the markup parity corpus and compare it with the recorded HTML."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--corpus",
+            type=str,
+            default=str(CORPUS_PATH),
+            help="Path to the JSON corpus of {name, source, html} cases (default: portal/markup_corpus.json).",
+        )
+        parser.add_argument(
+            "--case",
+            action="append",
+            default=[],
+            help="Only check the named case. May be given more than once.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["corpus"])
+        try:
+            cases = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read corpus {path}: {exc}")
+
+        selected = set(options["case"])
+        if selected:
+            cases = [case for case in cases if case["name"] in selected]
+            if not cases:
+                raise CommandError("No corpus cases matched --case.")
+
+        failures = []
+        for case in cases:
+            # analyze() also runs media extraction, which must survive any content.
+            actual = analyze(case["source"]).html
+            if actual != case["html"]:
+                failures.append((case, actual))
+
+        for case, actual in failures:
+            offset = _first_difference(case["html"], actual)
+            window = slice(max(0, offset - 40), offset + 40)
+            self.stdout.write(self.style.ERROR(f"Mismatch: {case['name']} (first difference at offset {offset})"))
+            self.stdout.write(f"  expected: {case['html'][window]!r}")
+            self.stdout.write(f"  actual:   {actual[window]!r}")
+
+        if failures:
+            raise CommandError(f"{len(failures)} of {len(cases)} corpus cases differ.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(cases)} corpus cases match."))
@@ -0,0 +1,116 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portal.services import delete_orphaned_media, orphaned_media
+
+
+class Command(BaseCommand):
+    help = "Delete (optionally archiving) media rows that no post references any more."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows deleted per transaction (default: 500).",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            help="Stop after deleting this many rows.",
+        )
+        parser.add_argument(
+            "--archive",
+            type=str,
+            help="Append each deleted row to this file as a JSON line before it is removed.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches so other writers can take the database lock (default: 0).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the orphaned rows without deleting anything.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        limit = options["limit"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be a positive integer.")
+        if limit is not None and limit <= 0:
+            raise CommandError("--limit must be a positive integer.")
+
+        if options["dry_run"]:
+            self._dry_run(limit)
+            return
+
+        archive = Path(options["archive"]).open("a", encoding="utf-8") if options["archive"] else None
+        progress = {"rows": 0, "bytes": 0}
+        started = time.perf_counter()
+
+        def on_batch(batch):
+            archive.writelines(json.dumps(_archived(media)) + "\n" for media in batch)
+            archive.flush()
+
+        def after_batch(batch, count):
+            progress["rows"] += count
+            progress["bytes"] += sum(_row_size(media) for media in batch)
+            self.stdout.write(f"Deleted {count} orphaned media (last id {batch[-1].pk}, {progress['rows']} so far).")
+            # Sleep outside the batch's transaction so other writers can take the lock.
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        try:
+            deleted = delete_orphaned_media(
+                batch_size=batch_size, limit=limit, on_batch=on_batch if archive else None, after_batch=after_batch
+            )
+        finally:
+            if archive:
+                archive.close()
+
+        if not deleted:
+            self.stdout.write(self.style.SUCCESS("No orphaned media."))
+            return
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reclaimed {deleted} orphaned media rows (~{progress['bytes'] / 1024:.1f} KiB of text) in {elapsed:.1f}s."
+            )
+        )
+
+    def _dry_run(self, limit):
+        total = size = 0
+        for media in orphaned_media().order_by("id").only("id", "url", "title", "thumbnail", "media_type").iterator():
+            if limit is not None and total >= limit:
+                break
+            total += 1
+            size += _row_size(media)
+            self.stdout.write(f"{media.pk}\t{media.media_type}\t{media.url}")
+        if not total:
+            self.stdout.write(self.style.SUCCESS("No orphaned media."))
+            return
+        self.stdout.write(
+            self.style.WARNING(f"Dry run: would delete {total} orphaned media rows (~{size / 1024:.1f} KiB of text).")
+        )
+
+
+def _archived(media) -> dict:
+    return {
+        "id": media.pk,
+        "url": media.url,
+        "title": media.title,
+        "media_type": media.media_type,
+        "thumbnail": media.thumbnail,
+        "created_at": media.created_at.isoformat() if media.created_at else None,
+    }
+
+
+def _row_size(media) -> int:
+    return sum(len(value.encode("utf-8")) for value in (media.url, media.url_hash, media.title, media.thumbnail))
@@ -0,0 +1,111 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portal import markup
+from portal.models import Post
+from portal.services import post_media_items, sync_posts_media
+
+from ._bulk import Checkpoint, batches
+
+
+class Command(BaseCommand):
+    help = "Rebuild Media rows and post links from the content of every post."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of extraction processes; 1 extracts in this process (default: CPU count).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Posts extracted and written per transaction (default: 200).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Rows fetched per database round trip while streaming posts (default: 500).",
+        )
+        parser.add_argument(
+            "--after-id",
+            type=int,
+            default=0,
+            help="Only process posts with an id greater than this one.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            help="File recording the last written post id; an existing checkpoint resumes the run.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches so other writers can take the database lock (default: 0).",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        batch_size = options["batch_size"]
+        if workers <= 0:
+            raise CommandError("--workers must be a positive integer.")
+        if batch_size <= 0 or options["chunk_size"] <= 0:
+            raise CommandError("--batch-size and --chunk-size must be positive integers.")
+
+        checkpoint = Checkpoint(options["checkpoint"])
+        after_id = max(options["after_id"], checkpoint.load())
+        if after_id:
+            self.stdout.write(self.style.WARNING(f"Resuming after post id {after_id}."))
+
+        posts = Post.objects.filter(pk__gt=after_id).order_by("pk").only("id", "title", "content", "thumbnail")
+        total = posts.count()
+        if not total:
+            self.stdout.write(self.style.SUCCESS("No posts to process."))
+            return
+
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        done = links = created = 0
+        started = time.perf_counter()
+        try:
+            for batch in batches(posts.iterator(chunk_size=options["chunk_size"]), batch_size):
+                batch_started = time.perf_counter()
+                contents = [post.content for post in batch]
+                if executor:
+                    extracted = executor.map(markup.extract_media, contents, chunksize=max(1, len(batch) // (workers * 4)))
+                else:
+                    extracted = map(markup.extract_media, contents)
+                wanted = [(post, post_media_items(post, media)) for post, media in zip(batch, extracted)]
+
+                # One short transaction per batch keeps the SQLite write lock brief.
+                result = sync_posts_media(wanted)
+                created += result.created
+                links += result.linked
+
+                done += len(batch)
+                checkpoint.save(batch[-1].pk)
+                elapsed = time.perf_counter() - batch_started
+                self.stdout.write(
+                    f"{done}/{total} posts (last id {batch[-1].pk}), "
+                    f"{len(batch) / elapsed:.0f} posts/s, {result.created} media created, {result.linked} links added."
+                )
+                if options["pause"]:
+                    time.sleep(options["pause"])
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+        checkpoint.clear()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt media for {done} posts in {elapsed:.1f}s ({done / elapsed:.0f} posts/s): "
+                f"{created} media created, {links} links added."
+            )
+        )
@@ -0,0 +1,117 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from portal import markup
+from portal.models import Post
+from portal.services import (
+    RENDERED_CONTENT_FIELDS,
+    bump_cache_version,
+    post_media_items,
+    post_page_version,
+    sync_posts_media,
+)
+
+from ._bulk import Checkpoint, batches
+
+
+class Command(BaseCommand):
+    help = "Re-render stored post HTML (and re-sync media) after a renderer upgrade."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-render every post, not only those rendered by an older renderer version.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of render processes; 1 renders in this process (default: CPU count).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Posts rendered and written back per batch (default: 200).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Rows fetched per database round trip while streaming posts (default: 500).",
+        )
+        parser.add_argument(
+            "--after-id",
+            type=int,
+            default=0,
+            help="Only process posts with an id greater than this one.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            help="File recording the last written post id; an existing checkpoint resumes the run.",
+        )
+        parser.add_argument(
+            "--skip-media",
+            action="store_true",
+            help="Only refresh the stored HTML; leave Media rows untouched.",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        batch_size = options["batch_size"]
+        if workers <= 0:
+            raise CommandError("--workers must be a positive integer.")
+        if batch_size <= 0 or options["chunk_size"] <= 0:
+            raise CommandError("--batch-size and --chunk-size must be positive integers.")
+
+        checkpoint = Checkpoint(options["checkpoint"])
+        after_id = max(options["after_id"], checkpoint.load())
+        if after_id:
+            self.stdout.write(self.style.WARNING(f"Resuming after post id {after_id}."))
+
+        posts = Post.objects.filter(pk__gt=after_id).order_by("pk")
+        if not options["all"]:
+            posts = posts.exclude(renderer_version=markup.RENDERER_VERSION)
+        fields = ["id", "title", "slug", "content", "thumbnail", *RENDERED_CONTENT_FIELDS]
+        total = posts.count()
+        if not total:
+            self.stdout.write(self.style.SUCCESS("No posts need re-rendering."))
+            return
+
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        done = 0
+        try:
+            for batch in batches(posts.only(*fields).iterator(chunk_size=options["chunk_size"]), batch_size):
+                contents = [post.content for post in batch]
+                if executor:
+                    analyses = executor.map(markup.analyze, contents, chunksize=max(1, len(batch) // (workers * 4)))
+                else:
+                    analyses = map(markup.analyze, contents)
+                for post, analysis in zip(batch, analyses):
+                    # Seed the memoised analysis so the refresh and media sync below reuse it.
+                    post._content_analysis = analysis
+                    post.refresh_rendered_content(force=True)
+
+                with transaction.atomic():
+                    Post.objects.bulk_update(batch, RENDERED_CONTENT_FIELDS)
+                    if not options["skip_media"]:
+                        sync_posts_media([(post, post_media_items(post)) for post in batch])
+                # bulk_update sends no signals; retire the cached pages of these posts here.
+                for post in batch:
+                    bump_cache_version(post_page_version(post.slug))
+
+                done += len(batch)
+                last_id = batch[-1].pk
+                checkpoint.save(last_id)
+                self.stdout.write(f"Rendered {done}/{total} posts (last id {last_id}).")
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+        checkpoint.clear()
+        self.stdout.write(self.style.SUCCESS(f"Re-rendered {done} posts with renderer version {markup.RENDERER_VERSION}."))
@@ -0,0 +1,87 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from portal import jobs
+
+
+def _run_job(job) -> bool:
+    try:
+        return jobs.run(job)
+    finally:
+        # Each pool thread opens its own connection; do not leave it dangling.
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Process queued background jobs (post excerpts, stored HTML and media sync) with a thread pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of worker threads (default: 4).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait before polling an empty queue again (default: 2).",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=600,
+            help="Requeue jobs left running for longer than this many seconds (default: 600).",
+        )
+        parser.add_argument(
+            "--gc-interval",
+            type=int,
+            default=0,
+            help="Queue an orphaned media collection every this many seconds; 0 disables it (default: 0).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        if workers <= 0:
+            raise CommandError("--workers must be a positive integer.")
+        stale_after = timedelta(seconds=options["stale_after"])
+
+        gc_interval = options["gc_interval"]
+        last_gc = None
+
+        succeeded = failed = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                while True:
+                    requeued = jobs.requeue_stale(stale_after)
+                    if requeued:
+                        self.stdout.write(self.style.WARNING(f"Requeued {requeued} stale jobs."))
+                    if gc_interval and (last_gc is None or time.monotonic() - last_gc >= gc_interval):
+                        jobs.enqueue_media_gc()
+                        last_gc = time.monotonic()
+                    batch = jobs.claim(workers * 2)
+                    if not batch:
+                        if options["once"]:
+                            break
+                        time.sleep(options["poll_interval"])
+                        continue
+                    for job, ok in zip(batch, executor.map(_run_job, batch)):
+                        if ok:
+                            succeeded += 1
+                        else:
+                            failed += 1
+                            self.stdout.write(self.style.ERROR(f"Job {job.pk} ({job.kind}) failed."))
+            except KeyboardInterrupt:
+                self.stdout.write(self.style.WARNING("Interrupted; finishing claimed jobs."))
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {succeeded + failed} jobs ({failed} failed)."))
@@ -0,0 +1,455 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from dataclasses import dataclass, field
+from html import unescape
+from itertools import accumulate, chain
+from typing import Iterable, Iterator, Sequence
+
+from django.utils.html import escape
+
+from .media_urls import YOUTUBE_EMBED_URL, YOUTUBE_THUMBNAIL_URL, video_thumbnail
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Post markup engine
+#
+# The content is tokenized once: fenced code is cut out with a single scan,
+# the remainder is split into logical lines grouped into blocks (the
+# "\n\n"-separated chunks the legacy renderer wrapped in paragraphs), and each
+# line is scanned once for inline atoms. Emphasis is resolved on a compact
+# per-line skeleton in which atoms occupy a single neutral character.
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Bump whenever the generated HTML changes so stored renders are refreshed.
+RENDERER_VERSION = 2
+
+CODE_BLOCK_HTML = (
+    '<pre class="code-block bg-sage-100 dark:bg-sage-800 rounded-xl p-4 overflow-x-auto my-4">'
+    '<code class="text-sm font-mono text-sage-800 dark:text-cream-100" data-lang="{lang}">{code}</code></pre>'
+)
+INLINE_CODE_HTML = '<code class="bg-sage-100 dark:bg-sage-800 px-2 py-0.5 rounded text-sm font-mono">{code}</code>'
+IMAGE_HTML = '<figure class="my-6"><img src="{url}" alt="{alt}" class="rounded-2xl shadow-lg max-w-full h-auto mx-auto" loading="lazy">{caption}</figure>'
+IMAGE_CAPTION_HTML = "<figcaption class=text-center text-sm text-sage-500 dark:text-sage-400 mt-2>{alt}</figcaption>"
+LINK_HTML = '<a href="{url}" class="text-sage-600 dark:text-cream-300 underline hover:text-sage-800 dark:hover:text-cream-100 transition-colors">{text}</a>'
+# Click-to-load facade: a thumbnail and play button that static/js/video-facade.js
+# replaces with the player iframe, so no player code loads until it is wanted.
+YOUTUBE_HTML = (
+    '<div class="video-facade relative w-full aspect-video my-6" data-embed-src="{embed_src}">'
+    '<a href="https://www.youtube.com/watch?v={video_id}" class="video-facade-play absolute inset-0 block rounded-2xl overflow-hidden shadow-lg" '
+    'aria-label="Play video"><img src="{thumbnail}" alt="" class="w-full h-full object-cover" loading="lazy">'
+    '<span class="absolute inset-0 flex items-center justify-center bg-black/20">'
+    '<span class="w-16 h-16 rounded-full bg-white/90 flex items-center justify-center shadow-lg">'
+    '<svg class="w-7 h-7 text-sage-800 ml-1" fill="currentColor" viewBox="0 0 24 24"><path d="M8 5v14l11-7z"></path></svg>'
+    "</span></span></a></div>"
+)
+HEADING_HTML = {
+    3: '<h3 class="text-xl font-serif font-semibold text-sage-800 dark:text-cream-100 mt-6 mb-3">{text}</h3>',
+    2: '<h2 class="text-2xl font-serif font-semibold text-sage-800 dark:text-cream-100 mt-8 mb-4">{text}</h2>',
+    1: '<h1 class="text-3xl font-serif font-bold text-sage-800 dark:text-cream-100 mt-8 mb-4">{text}</h1>',
+}
+LIST_ITEM_HTML = '<li class="text-sage-700 dark:text-cream-200">{text}</li>'
+PARAGRAPH_HTML = '<p class="text-sage-700 dark:text-cream-200 leading-relaxed mb-4">{text}</p>'
+RULE_HTML = '<hr class="my-8 border-sage-200 dark:border-sage-700">'
+GROUP_HTML = {
+    "ul": ('<ul class="list-disc list-inside space-y-2 my-4 ml-4">', "</ul>"),
+    "ol": ('<ol class="list-decimal list-inside space-y-2 my-4 ml-4">', "</ol>"),
+    "quote": (
+        '<blockquote class="border-l-4 border-sage-400 dark:border-sage-600 pl-4 py-2 my-4 italic text-sage-600 dark:text-sage-300">',
+        "</blockquote>",
+    ),
+}
+
+# Applied in this order; each rule sees the result of the previous ones.
+EMPHASIS_RULES: tuple[tuple[str, str, str], ...] = (
+    ("***", "<strong><em>", "</em></strong>"),
+    ("**", "<strong>", "</strong>"),
+    ("__", "<u>", "</u>"),
+    ("*", "<em>", "</em>"),
+    ("_", "<em>", "</em>"),
+)
+
+# Fenced code blocks are replaced by this marker inside logical lines.
+CODE_MARKER = "\x00"
+
+# Every pattern below runs in time linear in the line length: the language run
+# of a fence is possessive, and link text, alt text and URLs stop at the next
+# "[" so each bracket starts a scan over a disjoint stretch of the line.
+FENCE_RE = re.compile(r"```(\w*+)\n?([\s\S]*?)```")
+# The leading lookahead lets the scanner skip plain prose one character test at a time.
+INLINE_RE = re.compile(
+    r"(?=[\x00`!\[<hwyv])(?:"
+    r"(?P<fence>\x00)"
+    r"|`(?P<code>[^`\n\x00]+)`"
+    r"|!\[(?P<alt>[^\[\]\n\x00]*)\]\((?P<src>[^)\[\n\x00]+)\)"
+    r"|\[(?P<text>(?:!\[[^\[\]\n\x00]*\]\([^)\[\n\x00]+\)|[^\[\]\n\x00])+)\]\((?P<href>[^)\[\n\x00]+)\)"
+    r"|(?:https?://)?(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)(?P<video>[a-zA-Z0-9_-]+)"
+    r"|(?:https?://)?(?:www\.)?vimeo\.com/(?P<vimeo>\d+)"
+    r"|(?P<tag></?[A-Za-z!][^<>\n\x00]*>)"
+    r")"
+)
+INLINE_HINT_RE = re.compile(r"[`\[<*_\x00]|youtu|vimeo")
+UNORDERED_ITEM_RE = re.compile(r"[\-\*] ")
+ORDERED_ITEM_RE = re.compile(r"\d+\. ")
+RULE_RE = re.compile(r"---+")
+
+# Media discovered while rendering; see ``analyze``.
+MEDIA_TAG_RE = re.compile(r"<(?P<name>img|video|iframe)\b[^>]*?\ssrc=[\"'](?P<src>[^\"']+)[\"']", re.IGNORECASE)
+VIDEO_URL_RE = re.compile(
+    r"(?:youtube\.com/watch\?v=|youtu\.be/)(?P<youtube>[a-zA-Z0-9_-]+)|vimeo\.com/(?P<vimeo>\d+)"
+)
+TAG_RE = re.compile(r"<[^<>]*>")
+EXCERPT_LENGTH = 300
+WORDS_PER_MINUTE = 200
+
+
+@dataclass(slots=True)
+class Line:
+    text: str
+    start: int = 0
+    end: int = 0
+    # (lang, code) for each fenced block replaced by CODE_MARKER in ``text``.
+    code_blocks: Sequence[tuple[str, str]] = ()
+
+
+@dataclass(slots=True)
+class Block:
+    lines: list[Line] = field(default_factory=list)
+    source: str = ""
+
+
+def render_code_block(lang: str, code: str) -> str:
+    return CODE_BLOCK_HTML.format(lang=lang, code=escape(code))
+
+
+def _split_lines(content: str) -> list[Line]:
+    lines: list[Line] = []
+    head: list[str] = []
+    head_start = 0
+    code_blocks: list[tuple[str, str]] = []
+    position = 0
+    for match in chain(FENCE_RE.finditer(content), (None,)):
+        end = match.start() if match else len(content)
+        pieces = content[position:end].split("\n")
+        if len(pieces) > 1:
+            head.append(pieces[0])
+            first_end = position + len(pieces[0])
+            lines.append(Line("".join(head), head_start, first_end, code_blocks))
+            middle = pieces[1:-1]
+            starts = accumulate((len(piece) + 1 for piece in middle), initial=first_end + 1)
+            lines.extend(Line(piece, start, start + len(piece)) for piece, start in zip(middle, starts))
+            head, head_start, code_blocks = [], end - len(pieces[-1]), []
+        head.append(pieces[-1])
+        if match:
+            head.append(CODE_MARKER)
+            code_blocks.append((match.group(1), match.group(2)))
+            position = match.end()
+    lines.append(Line("".join(head), head_start, len(content), code_blocks))
+    return lines
+
+
+def _chunk_spans(texts: list[str]) -> list[tuple[int, int]]:
+    """Index ranges grouping ``texts`` the way ``"\\n".join(texts).split("\\n\\n")`` would."""
+    spans = []
+    start = 0
+    index = 1
+    last = len(texts) - 1
+    while True:
+        try:
+            index = texts.index("", index, last)
+        except ValueError:
+            break
+        spans.append((start, index))
+        start = index + 1
+        # The newline after a split point is consumed, so the next line cannot split.
+        index += 2
+    spans.append((start, len(texts)))
+    return spans
+
+
+def tokenize(content: str) -> list[Block]:
+    """Split content into blocks that render independently of each other.
+
+    ``render(content)`` is always the ``"\\n\\n"``-join of the rendered blocks,
+    and a block's HTML depends only on its ``source``.
+    """
+    if CODE_MARKER in content:
+        content = content.replace(CODE_MARKER, "\ufffd")
+    lines = _split_lines(content)
+    blocks = []
+    for start, end in _chunk_spans([line.text for line in lines]):
+        chunk = lines[start:end]
+        blocks.append(Block(chunk, content[chunk[0].start:chunk[-1].end]))
+    return blocks
+
+
+def _resolve_emphasis(skeleton: str) -> dict[int, tuple[str, int]]:
+    marks: dict[int, tuple[str, int]] = {}
+    for delimiter, open_html, close_html in EMPHASIS_RULES:
+        if delimiter not in skeleton:
+            continue
+        width = len(delimiter)
+        neutral = CODE_MARKER * width
+        pieces: list[str] = []
+        cursor = 0
+        while True:
+            start = skeleton.find(delimiter, cursor)
+            if start < 0:
+                break
+            end = skeleton.find(delimiter, start + width + 1)
+            if end < 0:
+                break
+            marks[start] = (open_html, width)
+            marks[end] = (close_html, width)
+            pieces.extend((skeleton[cursor:start], neutral, skeleton[start + width:end], neutral))
+            cursor = end + width
+        if pieces:
+            pieces.append(skeleton[cursor:])
+            skeleton = "".join(pieces)
+    return marks
+
+
+def _media_item(url: str, media_type: str, title: str = "") -> dict[str, str]:
+    url = url.strip()
+    thumbnail = video_thumbnail(url) if media_type == "video" else ""
+    return {"url": url, "title": title.strip(), "media_type": media_type, "thumbnail": thumbnail}
+
+
+def _video_url(url: str) -> str:
+    """Return the canonical watch URL if ``url`` points at a YouTube or Vimeo video."""
+    match = VIDEO_URL_RE.search(url)
+    if not match:
+        return ""
+    if match.lastgroup == "vimeo":
+        return f"https://vimeo.com/{match.group('vimeo')}"
+    return f"https://youtube.com/watch?v={match.group('youtube')}"
+
+
+def _collect_media(match: re.Match, media: list[dict[str, str]]) -> None:
+    kind = match.lastgroup
+    if kind == "src":
+        media.append(_media_item(match.group("src"), "image", match.group("alt")))
+    elif kind == "href":
+        href = match.group("href")
+        video = _video_url(href)
+        if video or match.group("text") == "video":
+            media.append(_media_item(video or href, "video"))
+    elif kind == "video":
+        media.append(_media_item(f"https://youtube.com/watch?v={match.group('video')}", "video"))
+    elif kind == "vimeo":
+        media.append(_media_item(f"https://vimeo.com/{match.group('vimeo')}", "video"))
+    elif kind == "tag":
+        tag = MEDIA_TAG_RE.match(match.group("tag"))
+        if tag:
+            media.append(_media_item(tag.group("src"), "image" if tag.group("name").lower() == "img" else "video"))
+
+
+def _render_atom(
+    match: re.Match, code_blocks: Iterator[tuple[str, str]], media: list[dict[str, str]] | None
+) -> str:
+    kind = match.lastgroup
+    if media is not None:
+        _collect_media(match, media)
+    if kind == "fence":
+        return render_code_block(*next(code_blocks, ("", "")))
+    if kind == "code":
+        return INLINE_CODE_HTML.format(code=match.group("code"))
+    if kind == "src":
+        alt = match.group("alt")
+        caption = IMAGE_CAPTION_HTML.format(alt=alt) if alt else ""
+        return IMAGE_HTML.format(url=match.group("src"), alt=alt, caption=caption)
+    if kind == "href":
+        return LINK_HTML.format(url=match.group("href"), text=render_inline(match.group("text"), media=media))
+    if kind == "video":
+        video_id = match.group("video")
+        return YOUTUBE_HTML.format(
+            video_id=video_id,
+            embed_src=YOUTUBE_EMBED_URL.format(id=video_id),
+            thumbnail=YOUTUBE_THUMBNAIL_URL.format(id=video_id),
+        )
+    return match.group(0)
+
+
+def render_inline(
+    text: str, code_blocks: Iterable[tuple[str, str]] = (), media: list[dict[str, str]] | None = None
+) -> str:
+    """Render one logical line; media found on the way is appended to ``media`` if given."""
+    if not INLINE_HINT_RE.search(text):
+        return text
+    code_blocks = iter(code_blocks)
+    atoms: dict[int, tuple[str, int]] = {}
+    pieces: list[str] = []
+    length = 0
+    position = 0
+    for match in INLINE_RE.finditer(text):
+        start = match.start()
+        if start > position:
+            pieces.append(text[position:start])
+            length += start - position
+        atoms[length] = (_render_atom(match, code_blocks, media), 1)
+        pieces.append(CODE_MARKER)
+        length += 1
+        position = match.end()
+    pieces.append(text[position:])
+    skeleton = "".join(pieces)
+
+    marks = _resolve_emphasis(skeleton)
+    if atoms:
+        marks.update(atoms)
+    if not marks:
+        return skeleton
+    out: list[str] = []
+    cursor = 0
+    for index in sorted(marks):
+        html, width = marks[index]
+        out.append(skeleton[cursor:index])
+        out.append(html)
+        cursor = index + width
+    out.append(skeleton[cursor:])
+    return "".join(out)
+
+
+def _heading_level(text: str) -> int:
+    if text.startswith("### ") and len(text) > 4:
+        return 3
+    if text.startswith("## ") and len(text) > 3:
+        return 2
+    if text.startswith("# ") and len(text) > 2:
+        return 1
+    return 0
+
+
+def _render_line(line: Line, media: list[dict[str, str]] | None = None) -> tuple[str, str]:
+    """Return ``(kind, html)`` where kind is ``ul``, ``ol``, ``quote`` or ``""``."""
+    if not line.text:
+        return "", ""
+    level = _heading_level(line.text)
+    if level:
+        text = render_inline(line.text[level + 1:], line.code_blocks, media)
+        return "", HEADING_HTML[level].format(text=text)
+    html = render_inline(line.text, line.code_blocks, media)
+    if UNORDERED_ITEM_RE.match(html):
+        return "ul", LIST_ITEM_HTML.format(text=html[2:])
+    marker = ORDERED_ITEM_RE.match(html)
+    if marker:
+        return "ol", LIST_ITEM_HTML.format(text=html[marker.end():])
+    if RULE_RE.fullmatch(html):
+        return "", RULE_HTML
+    if html.startswith("> "):
+        return "quote", html[2:]
+    return "", html
+
+
+def _wrap_paragraph(lines: list[str]) -> str:
+    start = 0
+    end = len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    if start == end:
+        return ""
+    lines = lines[start:end]
+    lines[0] = lines[0].lstrip()
+    lines[-1] = lines[-1].rstrip()
+    if lines[0].startswith("<"):
+        return "\n".join(lines)
+    wrapped = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped and not stripped.startswith("<"):
+            wrapped.append(PARAGRAPH_HTML.format(text=line))
+        else:
+            wrapped.append(line)
+    return "\n".join(wrapped)
+
+
+def render_block(block: Block, media: list[dict[str, str]] | None = None) -> str:
+    if not block.source:
+        return ""
+    out: list[str] = []
+    group = ""
+    for line in block.lines:
+        kind, html = _render_line(line, media)
+        if kind != group:
+            if group:
+                out.append(GROUP_HTML[group][1])
+            if kind:
+                out.append(GROUP_HTML[kind][0])
+            group = kind
+        out.append(html)
+    if group:
+        out.append(GROUP_HTML[group][1])
+    # A "> " line leaves an empty line inside its quote, which still splits
+    # paragraphs exactly like a blank source line would.
+    return "\n\n".join(_wrap_paragraph(out[start:end]) for start, end in _chunk_spans(out))
+
+
+def render(content: str) -> str:
+    return "\n\n".join(render_block(block) for block in tokenize(content))
+
+
+def render_stream(content: str) -> Iterator[str]:
+    """Yield ``render(content)`` in pieces, one block at a time."""
+    for index, block in enumerate(tokenize(content)):
+        if index:
+            yield "\n\n"
+        yield render_block(block)
+
+
+@dataclass(slots=True)
+class ContentAnalysis:
+    source: str
+    html: str
+    media: list[dict[str, str]]
+    excerpt: str
+    word_count: int
+    reading_minutes: int
+
+
+def analyze(content: str) -> ContentAnalysis:
+    """Render ``content`` and derive its media, excerpt and reading stats in the same pass.
+
+    Media comes from the rendered atoms, so images and videos quoted inside
+    code are not collected.
+    """
+    media: list[dict[str, str]] = []
+    html = "\n\n".join(render_block(block, media) for block in tokenize(content))
+    text = unescape(TAG_RE.sub(" ", html))
+    words = text.split()
+    plain = " ".join(words)
+    excerpt = plain[:EXCERPT_LENGTH].strip() + ("..." if len(plain) > EXCERPT_LENGTH else "")
+    return ContentAnalysis(
+        source=content,
+        html=html,
+        media=media,
+        excerpt=excerpt,
+        word_count=len(words),
+        reading_minutes=max(1, math.ceil(len(words) / WORDS_PER_MINUTE)),
+    )
+
+
+def extract_media(content: str) -> list[dict[str, str]]:
+    """Media referenced by ``content``, as collected by ``analyze``."""
+    return analyze(content).media
+
+
+def content_digest(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+__all__ = [
+    "RENDERER_VERSION",
+    "Block",
+    "ContentAnalysis",
+    "Line",
+    "analyze",
+    "content_digest",
+    "extract_media",
+    "render",
+    "render_block",
+    "render_inline",
+    "render_stream",
+    "tokenize",
+]
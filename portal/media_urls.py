@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+YOUTUBE_ID_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
+YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com", "youtube-nocookie.com", "www.youtube-nocookie.com"}
+YOUTUBE_PATH_PREFIXES = ("/embed/", "/shorts/", "/live/", "/v/")
+VIMEO_HOSTS = {"vimeo.com", "www.vimeo.com", "player.vimeo.com"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+YOUTUBE_THUMBNAIL_URL = "https://i.ytimg.com/vi/{id}/hqdefault.jpg"
+YOUTUBE_EMBED_URL = "https://www.youtube.com/embed/{id}"
+VIMEO_EMBED_URL = "https://player.vimeo.com/video/{id}"
+
+
+def _split(url: str):
+    """``urlsplit`` of a possibly scheme-less URL, or ``None`` when it is malformed (e.g. ``http://[x``)."""
+    try:
+        return urlsplit(url if "//" in url else f"https://{url}")
+    except ValueError:
+        return None
+
+
+def youtube_id(url: str) -> str:
+    """Return the video id of any YouTube URL form (watch, youtu.be, embed, shorts), or ``""``."""
+    parts = _split(url)
+    if parts is None:
+        return ""
+    host = (parts.hostname or "").lower()
+    candidate = ""
+    if host == "youtu.be":
+        candidate = parts.path.lstrip("/").split("/", 1)[0]
+    elif host in YOUTUBE_HOSTS:
+        if parts.path == "/watch":
+            candidate = parse_qs(parts.query).get("v", [""])[0]
+        elif parts.path.startswith(YOUTUBE_PATH_PREFIXES):
+            candidate = parts.path.split("/")[2]
+    return candidate if YOUTUBE_ID_RE.match(candidate) else ""
+
+
+def vimeo_id(url: str) -> str:
+    parts = _split(url)
+    if parts is None or (parts.hostname or "").lower() not in VIMEO_HOSTS:
+        return ""
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if segments and segments[0] == "video":
+        segments = segments[1:]
+    return segments[0] if segments and segments[0].isdigit() else ""
+
+
+def canonical_url(url: str) -> str:
+    """Normalise a media URL so every spelling of the same resource compares equal.
+
+    Scheme and host are lower-cased, default ports and fragments dropped, and
+    YouTube/Vimeo links collapse to a single watch URL per video. URLs that
+    cannot be parsed (e.g. ``http://[x``) come back stripped but otherwise as-is.
+    """
+    url = url.strip()
+    try:
+        return _canonical_url(url)
+    except ValueError:
+        return url
+
+
+def _canonical_url(url: str) -> str:
+    video = youtube_id(url)
+    if video:
+        return f"https://www.youtube.com/watch?v={video}"
+    video = vimeo_id(url)
+    if video:
+        return f"https://vimeo.com/{video}"
+
+    parts = urlsplit(url)
+    port = parts.port
+    if not parts.scheme or not parts.netloc:
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+    if parts.username is not None:
+        userinfo = parts.username + (f":{parts.password}" if parts.password is not None else "")
+        netloc = f"{userinfo}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def embed_url(url: str) -> str:
+    """Player URL for a YouTube or Vimeo link, or ``""`` for anything else."""
+    video = youtube_id(url)
+    if video:
+        return YOUTUBE_EMBED_URL.format(id=video)
+    video = vimeo_id(url)
+    return VIMEO_EMBED_URL.format(id=video) if video else ""
+
+
+def video_thumbnail(url: str) -> str:
+    """Thumbnail image for a video URL, derived from the video id without a network call.
+
+    Only YouTube serves thumbnails at an id-derived address; Vimeo needs an
+    oEmbed request, so its videos (and unknown hosts) get ``""``.
+    """
+    video = youtube_id(url)
+    return YOUTUBE_THUMBNAIL_URL.format(id=video) if video else ""
+
+
+def url_hash(url: str) -> str:
+    """Key of the unique media index: SHA-256 of the canonical URL."""
+    return hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+
+
+__all__ = ["canonical_url", "embed_url", "url_hash", "video_thumbnail", "vimeo_id", "youtube_id"]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-14 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0003_post_media_redesign"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="content_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="rendered_content",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="renderer_version",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+    ]
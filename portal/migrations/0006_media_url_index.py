@@ -0,0 +1,135 @@
+# Generated by Django 5.2.6 on 2026-10-14 23:56
+
+import hashlib
+import re
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+from django.db import migrations, models
+
+# Frozen copy of portal.media_urls as of this migration, so later changes to
+# canonicalisation do not change what it does.
+YOUTUBE_ID_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
+YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com", "youtube-nocookie.com", "www.youtube-nocookie.com"}
+YOUTUBE_PATH_PREFIXES = ("/embed/", "/shorts/", "/live/", "/v/")
+VIMEO_HOSTS = {"vimeo.com", "www.vimeo.com", "player.vimeo.com"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _split(url):
+    try:
+        return urlsplit(url if "//" in url else f"https://{url}")
+    except ValueError:
+        return None
+
+
+def youtube_id(url):
+    parts = _split(url)
+    if parts is None:
+        return ""
+    host = (parts.hostname or "").lower()
+    candidate = ""
+    if host == "youtu.be":
+        candidate = parts.path.lstrip("/").split("/", 1)[0]
+    elif host in YOUTUBE_HOSTS:
+        if parts.path == "/watch":
+            candidate = parse_qs(parts.query).get("v", [""])[0]
+        elif parts.path.startswith(YOUTUBE_PATH_PREFIXES):
+            candidate = parts.path.split("/")[2]
+    return candidate if YOUTUBE_ID_RE.match(candidate) else ""
+
+
+def vimeo_id(url):
+    parts = _split(url)
+    if parts is None or (parts.hostname or "").lower() not in VIMEO_HOSTS:
+        return ""
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if segments and segments[0] == "video":
+        segments = segments[1:]
+    return segments[0] if segments and segments[0].isdigit() else ""
+
+
+def canonical_url(url):
+    url = url.strip()
+    try:
+        video = youtube_id(url)
+        if video:
+            return f"https://www.youtube.com/watch?v={video}"
+        video = vimeo_id(url)
+        if video:
+            return f"https://vimeo.com/{video}"
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.netloc:
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+    if parts.username is not None:
+        userinfo = parts.username + (f":{parts.password}" if parts.password is not None else "")
+        netloc = f"{userinfo}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def url_hash(url):
+    return hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+
+
+def fold_duplicate_media(apps, schema_editor):
+    """Canonicalise every URL and merge rows that now share one, keeping the oldest."""
+    Media = apps.get_model("portal", "Media")
+    keepers = {}
+    duplicate_ids = []
+    for media in Media.objects.order_by("created_at", "id").iterator():
+        canonical = canonical_url(media.url)
+        digest = url_hash(canonical)
+        keeper = keepers.get(digest)
+        if keeper is None:
+            media.url = canonical
+            media.url_hash = digest
+            media.save(update_fields=["url", "url_hash"])
+            keepers[digest] = media
+        else:
+            duplicate_ids.append(media.id)
+            if not keeper.title and media.title:
+                keeper.title = media.title
+                keeper.save(update_fields=["title"])
+            if keeper.post_id is None and media.post_id is not None:
+                keeper.post_id = media.post_id
+                keeper.save(update_fields=["post"])
+        if media.post_id is not None:
+            keeper = keepers[digest]
+            keeper.posts.add(media.post_id)
+    Media.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0005_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="media",
+            name="posts",
+            field=models.ManyToManyField(blank=True, related_name="media", to="portal.post"),
+        ),
+        migrations.AddField(
+            model_name="media",
+            name="url_hash",
+            field=models.CharField(default="", editable=False, max_length=64),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name="media",
+            name="url",
+            field=models.URLField(help_text="Canonical URL; see portal.media_urls"),
+        ),
+        migrations.RunPython(fold_duplicate_media, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-14 23:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Separate from 0006 so the unique index is built after the fold has committed."""
+
+    dependencies = [
+        ("portal", "0006_media_url_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="media",
+            name="url_hash",
+            field=models.CharField(editable=False, max_length=64, unique=True),
+        ),
+    ]
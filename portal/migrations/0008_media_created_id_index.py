@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-14 23:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0007_media_url_hash_unique"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="media",
+            options={"ordering": ["-created_at", "-id"], "verbose_name_plural": "media"},
+        ),
+        migrations.AddIndex(
+            model_name="media",
+            index=models.Index(fields=["-created_at", "-id"], name="portal_media_created_id_idx"),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-15 09:12
+
+import re
+from urllib.parse import parse_qs, urlsplit
+
+from django.db import migrations
+
+# Frozen copy of portal.media_urls.video_thumbnail as of this migration.
+YOUTUBE_ID_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
+YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com", "youtube-nocookie.com", "www.youtube-nocookie.com"}
+YOUTUBE_PATH_PREFIXES = ("/embed/", "/shorts/", "/live/", "/v/")
+YOUTUBE_THUMBNAIL_URL = "https://i.ytimg.com/vi/{id}/hqdefault.jpg"
+
+
+def youtube_id(url):
+    try:
+        parts = urlsplit(url if "//" in url else f"https://{url}")
+    except ValueError:
+        return ""
+    host = (parts.hostname or "").lower()
+    candidate = ""
+    if host == "youtu.be":
+        candidate = parts.path.lstrip("/").split("/", 1)[0]
+    elif host in YOUTUBE_HOSTS:
+        if parts.path == "/watch":
+            candidate = parse_qs(parts.query).get("v", [""])[0]
+        elif parts.path.startswith(YOUTUBE_PATH_PREFIXES):
+            candidate = parts.path.split("/")[2]
+    return candidate if YOUTUBE_ID_RE.match(candidate) else ""
+
+
+def video_thumbnail(url):
+    video = youtube_id(url)
+    return YOUTUBE_THUMBNAIL_URL.format(id=video) if video else ""
+
+
+def derive_video_thumbnails(apps, schema_editor):
+    """Fill the thumbnail of existing video rows from their video id."""
+    Media = apps.get_model("portal", "Media")
+    updated = []
+    for media in Media.objects.filter(media_type="video", thumbnail="").only("id", "url").iterator():
+        media.thumbnail = video_thumbnail(media.url)
+        if media.thumbnail:
+            updated.append(media)
+    Media.objects.bulk_update(updated, ["thumbnail"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0008_media_created_id_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(derive_video_thumbnails, migrations.RunPython.noop),
+    ]
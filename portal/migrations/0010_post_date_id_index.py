@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-15 00:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0009_media_video_thumbnails"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(fields=["-date", "-id"], name="portal_post_date_id_idx"),
+        ),
+    ]
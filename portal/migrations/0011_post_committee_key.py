@@ -0,0 +1,78 @@
+# Generated by Django 5.2.6 on 2026-10-15 00:05
+
+from django.db import migrations, models
+
+# Frozen copy of portal.constants as of this migration, so later changes to
+# the committee table or the normalizer do not change what it writes.
+COMMITTEES = (
+    ("sports", "Sports Committee", ("athletics", "sports committee")),
+    ("social", "Social Committee", ("social committee",)),
+    ("cultural", "Cultural Committee", ("culture", "cultral", "cultural committee")),
+    ("science", "Science Committee", ("stem", "science committee")),
+    ("art", "Art Committee", ("arts", "art committee")),
+)
+
+
+def normalize_committee_key(raw):
+    if raw is None:
+        raw = ""
+    token = raw.strip().lower()
+    if token.startswith("/"):
+        token = token.lstrip("/")
+    if token.endswith("/"):
+        token = token.rstrip("/")
+    if token.endswith(".html"):
+        token = token[: -len(".html")]
+    token = token.replace("_", " ").replace("-", " ")
+    token = " ".join(token.split())
+    if token.endswith("committee") and not token.endswith(" committee"):
+        token = token.replace("committee", " committee")
+
+    candidates = {token}
+    candidates.add(token.replace(" committee", ""))
+
+    for key, name, aliases in COMMITTEES:
+        if key == token:
+            return key
+        if name.lower() == token:
+            return key
+        if key in candidates:
+            return key
+        if name.lower() in candidates:
+            return key
+        for alias in aliases:
+            alias_token = " ".join(alias.lower().replace("_", " ").replace("-", " ").split())
+            if alias_token in candidates:
+                return key
+    return ""
+
+
+def backfill_committee_keys(apps, schema_editor):
+    """Store the normalized key of every post's free-text committee."""
+    Post = apps.get_model("portal", "Post")
+    updated = []
+    for post in Post.objects.exclude(committee="").only("id", "committee").iterator():
+        post.committee_key = normalize_committee_key(post.committee)
+        if post.committee_key:
+            updated.append(post)
+    Post.objects.bulk_update(updated, ["committee_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0010_post_date_id_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="committee_key",
+            field=models.CharField(blank=True, default="", editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(fields=["committee_key", "-date", "-id"], name="portal_post_committee_idx"),
+        ),
+        migrations.RunPython(backfill_committee_keys, migrations.RunPython.noop),
+    ]
@@ -5,7 +5,9 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils import timezone
 
-from .constants import committee_by_key
+from . import markup
+from .constants import committee_by_key, normalize_committee_key
+from .media_urls import canonical_url, embed_url, url_hash, video_thumbnail
 
 
 class AccountUser(AbstractUser):
@@ -74,32 +76,134 @@ class Post(models.Model):
     thumbnail = models.URLField(blank=True, help_text="Optional thumbnail image URL")
     date = models.DateField(default=timezone.now)
     committee = models.CharField(max_length=64, blank=True)
+    # normalize_committee_key(committee), kept in step on save so committee pages filter in SQL.
+    committee_key = models.CharField(max_length=64, blank=True, default="", editable=False)
+    rendered_content = models.TextField(blank=True, editable=False)
+    renderer_version = models.PositiveSmallIntegerField(default=0, editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-date", "-id"]
+        # The blog index seeks on (date, id); see portal.pagination.
+        indexes = [
+            models.Index(fields=["-date", "-id"], name="portal_post_date_id_idx"),
+            models.Index(fields=["committee_key", "-date", "-id"], name="portal_post_committee_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.title
 
-    def save(self, *args, **kwargs):
+    # Fields whose edits change what sync_post_media() would write.
+    MEDIA_SOURCE_FIELDS = frozenset({"content", "thumbnail", "title"})
+    RENDERED_FIELDS = ("rendered_content", "renderer_version", "content_hash")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._remember_loaded_values(fields)
+
+    def _tracked_fields(self) -> list[str]:
+        return [field.attname for field in self._meta.concrete_fields if not field.primary_key]
+
+    def _remember_loaded_values(self, fields=None) -> None:
+        # Deferred fields are absent from __dict__ and simply not remembered.
+        names = self._tracked_fields() if fields is None else fields
+        loaded = {name: self.__dict__[name] for name in names if name in self.__dict__}
+        if fields is None or not hasattr(self, "_loaded_values"):
+            self._loaded_values = loaded
+        else:
+            self._loaded_values.update(loaded)
+
+    @property
+    def changed_fields(self) -> set[str]:
+        """Fields assigned a different value since the row was loaded (all of them for a new post)."""
+        loaded = getattr(self, "_loaded_values", None)
+        if self._state.adding or loaded is None:
+            return set(self._tracked_fields())
+        return {
+            name
+            for name in self._tracked_fields()
+            if name in self.__dict__ and (name not in loaded or self.__dict__[name] != loaded[name])
+        }
+
+    def _unique_slug(self) -> str:
         from django.utils.text import slugify
-        import re
+        base_slug = slugify(self.title)[:200]
+        taken = set(
+            Post.objects.filter(slug__startswith=base_slug).exclude(pk=self.pk).values_list("slug", flat=True)
+        )
+        slug = base_slug
+        counter = 1
+        while slug in taken:
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        return slug
+
+    def save(self, *args, derive: bool = True, **kwargs):
+        """Save the post; ``derive=False`` leaves the excerpt and stored HTML to a background job."""
+        changed = self.changed_fields
+        derived = set()
         if not self.slug:
-            base_slug = slugify(self.title)[:200]
-            slug = base_slug
-            counter = 1
-            while Post.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        if not self.excerpt:
-            # Strip HTML/Markdown and get first 300 chars
-            text = re.sub(r'<[^>]+>', '', self.content)
-            text = re.sub(r'[#*_`\[\]!]', '', text)
-            self.excerpt = text[:300].strip() + ('...' if len(text) > 300 else '')
+            self.slug = self._unique_slug()
+            derived.add("slug")
+        if "committee" in changed:
+            committee_key = normalize_committee_key(self.committee)
+            if committee_key != self.committee_key:
+                self.committee_key = committee_key
+                derived.add("committee_key")
+        if derive:
+            derived.update(self.derive_content_fields(changed))
+
+        # Existing rows only write the columns that actually changed.
+        if not self._state.adding and not kwargs.get("force_insert"):
+            update_fields = kwargs.get("update_fields")
+            if update_fields is None:
+                update_fields = changed | {"updated_at"}
+            kwargs["update_fields"] = set(update_fields) | derived
         super().save(*args, **kwargs)
+        self.saved_fields = changed | derived
+        self._remember_loaded_values()
+
+    def derive_content_fields(self, changed=None) -> set[str]:
+        """Fill the excerpt and stored HTML from ``content``; returns the fields it set."""
+        derived = set()
+        if not self.excerpt:
+            self.excerpt = self.analyze_content().excerpt
+            derived.add("excerpt")
+        if changed is None or "content" in changed or self.renderer_version != markup.RENDERER_VERSION:
+            if self.refresh_rendered_content():
+                derived.update(self.RENDERED_FIELDS)
+        return derived
+
+    @property
+    def rendered_is_stale(self) -> bool:
+        if self.renderer_version != markup.RENDERER_VERSION:
+            return True
+        return self.content_hash != markup.content_digest(self.content)
+
+    def analyze_content(self) -> markup.ContentAnalysis:
+        """Analyse ``content`` once; the result is reused until the text changes."""
+        analysis = getattr(self, "_content_analysis", None)
+        if analysis is None or analysis.source != self.content:
+            analysis = self._content_analysis = markup.analyze(self.content)
+        return analysis
+
+    def refresh_rendered_content(self, force: bool = False) -> bool:
+        """Re-render ``content`` into the stored columns if it changed or the renderer was upgraded."""
+        digest = markup.content_digest(self.content)
+        if not force and self.renderer_version == markup.RENDERER_VERSION and self.content_hash == digest:
+            return False
+        self.rendered_content = self.analyze_content().html
+        self.renderer_version = markup.RENDERER_VERSION
+        self.content_hash = digest
+        return True
 
     @property
     def committee_label(self) -> str:
@@ -127,6 +231,14 @@ class Video(models.Model):
     def __str__(self) -> str:
         return self.title
 
+    @property
+    def embed_url(self) -> str:
+        return embed_url(self.url)
+
+    @property
+    def poster(self) -> str:
+        return self.image or video_thumbnail(self.url)
+
 
 class Media(models.Model):
     """Media files extracted from posts or uploaded directly"""
@@ -135,19 +247,31 @@ class Media(models.Model):
         VIDEO = "video", "Video"
 
     title = models.CharField(max_length=200, blank=True)
-    url = models.URLField()
+    url = models.URLField(help_text="Canonical URL; see portal.media_urls")
+    url_hash = models.CharField(max_length=64, unique=True, editable=False)
     media_type = models.CharField(max_length=16, choices=MediaType.choices, default=MediaType.IMAGE)
+    # The post the gallery links to; every referencing post is in ``posts``.
     post = models.ForeignKey(Post, on_delete=models.SET_NULL, null=True, blank=True, related_name="media_items")
+    posts = models.ManyToManyField(Post, blank=True, related_name="media")
     thumbnail = models.URLField(blank=True, help_text="Thumbnail for videos")
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
         verbose_name_plural = "media"
+        # Gallery pages seek on (created_at, id); see portal.pagination.
+        indexes = [models.Index(fields=["-created_at", "-id"], name="portal_media_created_id_idx")]
 
     def __str__(self) -> str:
         return self.title or self.url
 
+    def save(self, *args, **kwargs):
+        self.url = canonical_url(self.url)
+        self.url_hash = url_hash(self.url)
+        if self.media_type == self.MediaType.VIDEO and not self.thumbnail:
+            self.thumbnail = video_thumbnail(self.url)
+        super().save(*args, **kwargs)
+
 
 class ChatMessage(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="chat_messages")
@@ -208,3 +332,29 @@ class ChatTaskItem(models.Model):
 
     def __str__(self) -> str:
         return self.label
+
+
+class Job(models.Model):
+    """Deferred work picked up by ``manage.py run_workers``."""
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    kind = models.CharField(max_length=64)
+    key = models.CharField(max_length=200, unique=True, help_text="Idempotency key; one job per key")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [models.Index(fields=["status", "id"], name="portal_job_status_id_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.kind} ({self.status})"
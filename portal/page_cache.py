@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+from functools import wraps
+from typing import Callable
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from . import markup
+from .services import cache_versions, shared_cache
+
+
+def _is_htmx(request: HttpRequest) -> bool:
+    return request.headers.get("HX-Request") == "true"
+
+
+def page_cache_key(request: HttpRequest, versions: list[int]) -> str:
+    """Key of a cached page: the request path, whether htmx asked for it, and its content versions.
+
+    The renderer version is part of it too, so an upgrade retires pages
+    rendered by the old renderer and their next request backfills the post.
+    """
+    variant = "htmx" if _is_htmx(request) else "page"
+    digest = hashlib.sha1(request.get_full_path().encode("utf-8")).hexdigest()
+    return f"portal:page:{markup.RENDERER_VERSION}:{variant}:{'.'.join(map(str, versions))}:{digest}"
+
+
+def page_cache_enabled() -> bool:
+    """PAGE_CACHE_ENABLED, or when it is unset, whether the cache is shared by every process."""
+    if settings.PAGE_CACHE_ENABLED is None:
+        return shared_cache()
+    return settings.PAGE_CACHE_ENABLED
+
+
+def _cacheable_request(request: HttpRequest) -> bool:
+    # Pending flash messages are per visitor; showing them would consume them.
+    return request.method == "GET" and not request.user.is_authenticated and not len(get_messages(request))
+
+
+def _cacheable_response(request: HttpRequest, response: HttpResponse) -> bool:
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        # A rendered CSRF token is tied to this visitor's cookie.
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+    )
+
+
+def versioned_etag(*versions: str) -> Callable[..., str | None]:
+    """ETag function for ``django.views.decorators.http.condition`` built from content versions.
+
+    ``versions`` work as in ``cache_anonymous_page``. The tag also covers the
+    renderer version, who is asking (user, CSRF cookie) and whether htmx
+    asked, so a 304 never hands out a stale rendering or another visitor's
+    page. Computing it costs cache reads only. No tag is sent unless the
+    cache is shared by every process: a version bumped by a worker would
+    otherwise leave a stale tag matching.
+    """
+    def etag(request: HttpRequest, *args, **kwargs) -> str | None:
+        if not shared_cache() or len(get_messages(request)):
+            return None
+        parts = [
+            *map(str, cache_versions([name.format(**kwargs) for name in versions])),
+            str(markup.RENDERER_VERSION),
+            "htmx" if _is_htmx(request) else "page",
+            str(request.user.pk or ""),
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        ]
+        return hashlib.sha1("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    return etag
+
+
+def cache_anonymous_page(*versions: str) -> Callable:
+    """Serve a view's GET responses to anonymous visitors from the cache.
+
+    ``versions`` name the content the page shows (``services.POSTS_VERSION``,
+    ...) and may use the view's keyword arguments, e.g. ``"post:{slug}"``.
+    The model signals in ``portal.signals`` bump them on every save and
+    delete, which retires the cached pages immediately; PAGE_CACHE_TIMEOUT
+    only bounds how long unused pages take up space. That relies on a cache
+    shared by every process, see ``page_cache_enabled``.
+    """
+    def decorator(view_func: Callable) -> Callable:
+        @wraps(view_func)
+        def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            if not page_cache_enabled() or not _cacheable_request(request):
+                response = view_func(request, *args, **kwargs)
+                patch_vary_headers(response, ["HX-Request"])
+                return response
+
+            key = page_cache_key(request, cache_versions([name.format(**kwargs) for name in versions]))
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                response = view_func(request, *args, **kwargs)
+                if _cacheable_response(request, response):
+                    cache.set(key, (response.content, response["Content-Type"]), settings.PAGE_CACHE_TIMEOUT)
+            patch_vary_headers(response, ["HX-Request"])
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+__all__ = ["cache_anonymous_page", "page_cache_enabled", "page_cache_key", "versioned_etag"]
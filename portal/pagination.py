@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+
+@dataclass
+class KeysetPage:
+    items: list = field(default_factory=list)
+    next_cursor: str = ""
+
+    @property
+    def has_next(self) -> bool:
+        return bool(self.next_cursor)
+
+
+def encode_cursor(data: dict[str, Any]) -> str:
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> dict[str, Any] | None:
+    """Decode a cursor from ``encode_cursor``; malformed tokens yield ``None``."""
+    if not token:
+        return None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def keyset_page(
+    queryset: QuerySet,
+    cursor: dict[str, Any] | None,
+    size: int,
+    extra: dict[str, Any] | None = None,
+    key: tuple[str, str] = ("created_at", "id"),
+) -> KeysetPage:
+    """Return the ``size`` rows after ``cursor``, newest first by the ``(column, tie-breaker)`` ``key``.
+
+    Seeks with a ``WHERE (column, id) < (...)`` condition instead of OFFSET,
+    and fetches one extra row to learn whether a next page exists instead of
+    counting. ``extra`` is carried along in the next cursor.
+    """
+    column, tiebreak = key
+    queryset = queryset.order_by(f"-{column}", f"-{tiebreak}")
+    if cursor:
+        opts = queryset.model._meta
+        try:
+            value = opts.get_field(column).to_python(cursor[column])
+            last = opts.get_field(tiebreak).to_python(cursor[tiebreak])
+        except (KeyError, TypeError, ValidationError):
+            pass
+        else:
+            if value is not None and last is not None:
+                queryset = queryset.filter(
+                    Q(**{f"{column}__lt": value}) | Q(**{column: value, f"{tiebreak}__lt": last})
+                )
+    rows = list(queryset[: size + 1])
+    page = KeysetPage(items=rows[:size])
+    if len(rows) > size:
+        last_row = page.items[-1]
+        page.next_cursor = encode_cursor(
+            {**(extra or {}), column: getattr(last_row, column).isoformat(), tiebreak: getattr(last_row, tiebreak)}
+        )
+    return page
+
+
+__all__ = ["KeysetPage", "decode_cursor", "encode_cursor", "keyset_page"]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import markup
+
+
+class RenderCache:
+    """Bounded LRU of rendered HTML keyed by content digest and renderer version.
+
+    Entries are kept in-process; when ``backend_alias`` names a ``CACHES``
+    entry, misses fall through to that shared backend before rendering.
+    """
+
+    def __init__(self, max_bytes: int, backend_alias: str = "", timeout: int | None = None, namespace: str = "render") -> None:
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.backend_alias = backend_alias
+        self.timeout = timeout
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def key(self, content: str) -> str:
+        return f"portal:{self.namespace}:{markup.RENDERER_VERSION}:{markup.content_digest(content)}"
+
+    def get_or_render(self, content: str, render: Callable[[str], str] = markup.render) -> str:
+        key = self.key(content)
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return html
+
+        backend = caches[self.backend_alias] if self.backend_alias else None
+        if backend is not None:
+            html = backend.get(key)
+            if html is not None:
+                with self._lock:
+                    self.shared_hits += 1
+                self._store(key, html)
+                return html
+
+        with self._lock:
+            self.misses += 1
+        html = render(content)
+        self._store(key, html)
+        if backend is not None:
+            backend.set(key, html, self.timeout)
+        return html
+
+    def _store(self, key: str, html: str) -> None:
+        size = sys.getsizeof(html)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= sys.getsizeof(previous)
+            self._entries[key] = html
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= sys.getsizeof(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+
+preview_render_cache = RenderCache(
+    max_bytes=settings.RENDER_CACHE_MAX_BYTES,
+    backend_alias=settings.RENDER_CACHE_ALIAS,
+    timeout=settings.RENDER_CACHE_TIMEOUT,
+)
+
+# Per-block renders stay in-process: a shared round trip per block would cost more than rendering it.
+preview_block_cache = RenderCache(
+    max_bytes=settings.RENDER_BLOCK_CACHE_MAX_BYTES,
+    namespace="render-block",
+)
+
+
+def render_incremental(content: str) -> str:
+    """Render ``content`` block by block, reusing cached HTML for unchanged blocks."""
+    return "\n\n".join(
+        preview_block_cache.get_or_render(block.source, lambda _source, block=block: markup.render_block(block))
+        for block in markup.tokenize(content)
+    )
+
+
+__all__ = ["RenderCache", "preview_block_cache", "preview_render_cache", "render_incremental"]
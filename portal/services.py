@@ -1,18 +1,24 @@
 from __future__ import annotations
 
-import re
+import hashlib
+import time
 from dataclasses import dataclass, field
-from typing import Iterable, Sequence
+from typing import Callable, Iterable, Iterator, Sequence
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Case, IntegerField, Q, Value, When
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, Exists, IntegerField, OuterRef, Q, QuerySet, Value, When
 from django.db.models.functions import Coalesce
 from django.utils import timezone
-from django.utils.html import escape
 from django.utils.safestring import mark_safe
 
+from . import markup
 from .constants import COMMITTEES, committee_by_key, normalize_committee_key
+from .media_urls import canonical_url, url_hash
 from .models import ChatMessage, ChatTask, ChatTaskItem, Media, Post, Video
+from .render_cache import preview_render_cache, render_incremental
 
 User = get_user_model()
 
@@ -296,12 +302,24 @@ def committees_for_context():
     return COMMITTEES
 
 
+# Columns list pages show; the post body and its stored HTML stay in the database.
+POST_CARD_FIELDS = ("id", "title", "slug", "excerpt", "thumbnail", "date", "committee")
+VIDEO_CARD_FIELDS = ("id", "title", "url", "image")
+# Gallery cards link to their post by slug and show its title; the post body is never needed.
+MEDIA_CARD_FIELDS = ("id", "url", "title", "media_type", "thumbnail", "created_at", "post__title", "post__slug")
+
+
+def post_cards(queryset: QuerySet[Post] | None = None) -> QuerySet[Post]:
+    """Posts loaded with only the card fields; touching ``content`` on them costs a query per post."""
+    return (Post.objects.all() if queryset is None else queryset).only(*POST_CARD_FIELDS)
+
+
 def posts_by_committee() -> dict[str, list[Post]]:
-    return {"Posts": list(Post.objects.all())}
+    return {"Posts": list(post_cards())}
 
 
 def videos_by_category() -> dict[str, list[Video]]:
-    return {"Videos": list(Video.objects.all())}
+    return {"Videos": list(Video.objects.only(*VIDEO_CARD_FIELDS))}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -310,83 +328,304 @@ def videos_by_category() -> dict[str, list[Video]]:
 
 def extract_media_from_content(content: str) -> list[dict]:
     """Extract image and video URLs from post content"""
-    media_items = []
-    
-    # Markdown image pattern: ![alt](url)
-    md_images = re.findall(r'!\[([^\]]*)\]\(([^)]+)\)', content)
-    for alt, url in md_images:
-        media_items.append({
-            "url": url.strip(),
-            "title": alt.strip() or "",
-            "media_type": "image"
-        })
-    
-    # HTML img pattern: <img src="url" ...>
-    html_images = re.findall(r'<img[^>]+src=["\']([^"\']+)["\'][^>]*>', content, re.IGNORECASE)
-    for url in html_images:
-        media_items.append({
-            "url": url.strip(),
-            "title": "",
-            "media_type": "image"
-        })
-    
-    # Markdown video/embed pattern: [video](url) or special syntax
-    # YouTube/Vimeo embedded links
-    video_patterns = [
-        r'\[video\]\(([^)]+)\)',
-        r'(?:https?://)?(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]+)',
-        r'(?:https?://)?(?:www\.)?vimeo\.com/(\d+)',
-    ]
-    
-    for pattern in video_patterns:
-        matches = re.findall(pattern, content)
-        for match in matches:
-            url = match if match.startswith('http') else f"https://youtube.com/watch?v={match}"
-            media_items.append({
-                "url": url,
-                "title": "",
-                "media_type": "video"
-            })
-    
-    # HTML video/iframe patterns
-    html_videos = re.findall(r'<(?:video|iframe)[^>]+src=["\']([^"\']+)["\'][^>]*>', content, re.IGNORECASE)
-    for url in html_videos:
-        media_items.append({
-            "url": url.strip(),
-            "title": "",
-            "media_type": "video"
-        })
-    
-    return media_items
-
-
-def sync_post_media(post: Post) -> None:
-    """Extract media from post content and sync with Media model"""
-    # Remove existing media links for this post
-    Media.objects.filter(post=post).delete()
-    
-    # Extract and create new media entries
-    media_items = extract_media_from_content(post.content)
-    
-    # Also include thumbnail if present
+    return markup.extract_media(content)
+
+
+@dataclass
+class MediaSyncResult:
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    linked: int = 0
+    unlinked: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.created or self.updated or self.deleted or self.linked or self.unlinked)
+
+
+def post_media_items(post: Post, media: Iterable[dict] | None = None) -> dict[str, dict]:
+    """Media the post should reference, keyed by canonical URL in first-seen order (thumbnail first).
+
+    ``media`` is the extracted content media; by default the post's own analysis is used.
+    """
+    items: dict[str, dict] = {}
     if post.thumbnail:
-        media_items.insert(0, {
-            "url": post.thumbnail,
-            "title": f"Thumbnail: {post.title}",
-            "media_type": "image"
-        })
-    
-    # Create Media objects, avoiding duplicates
-    seen_urls = set()
-    for item in media_items:
-        if item["url"] not in seen_urls:
-            seen_urls.add(item["url"])
-            Media.objects.create(
+        url = canonical_url(post.thumbnail)
+        items[url] = {"url": url, "title": f"Thumbnail: {post.title}", "media_type": "image", "thumbnail": ""}
+    if media is None:
+        # Reuse the analysis made when the post was saved
+        media = post.analyze_content().media
+    for item in media:
+        url = canonical_url(item["url"])
+        if url and url not in items:
+            items[url] = {**item, "url": url}
+    return items
+
+
+def sync_post_media(post: Post) -> MediaSyncResult:
+    """Link the post to one shared Media row per canonical URL it references."""
+    return sync_posts_media([(post, post_media_items(post))])
+
+
+def release_post_media(post: Post) -> MediaSyncResult:
+    """Unlink a post that is about to be deleted from all of its media."""
+    return sync_posts_media([(post, {})])
+
+
+def _insert_media(rows: list[Media]) -> int:
+    """Insert ``rows`` and return how many were actually inserted.
+
+    Another post may insert the same URL concurrently; the unique hash settles
+    it. The common case is one bulk insert; after a conflict each row is
+    retried on its own so the rows another writer won are not counted.
+    """
+    try:
+        with transaction.atomic():
+            Media.objects.bulk_create(rows)
+        return len(rows)
+    except IntegrityError:
+        pass
+    inserted = 0
+    for media in rows:
+        try:
+            with transaction.atomic():
+                Media.objects.bulk_create([media])
+        except IntegrityError:
+            continue
+        inserted += 1
+    return inserted
+
+
+def sync_posts_media(wanted: Sequence[tuple[Post, dict[str, dict]]]) -> MediaSyncResult:
+    """Sync several posts' media links at once with bulk queries; ``wanted`` pairs posts with ``post_media_items``."""
+    result = MediaSyncResult()
+    hashed = {post.pk: {url_hash(url): item for url, item in items.items()} for post, items in wanted}
+    first_claim: dict[str, tuple[int, dict]] = {}
+    for post_id, by_hash in hashed.items():
+        for digest, item in by_hash.items():
+            first_claim.setdefault(digest, (post_id, item))
+    links = Media.posts.through
+    fields = ("id", "url_hash", "title", "media_type", "thumbnail", "post")
+    with transaction.atomic():
+        media_by_hash = {media.url_hash: media for media in Media.objects.filter(url_hash__in=first_claim).only(*fields)}
+        missing = [
+            Media(
                 url=item["url"],
+                url_hash=digest,
                 title=item["title"],
                 media_type=item["media_type"],
-                post=post
+                thumbnail=item.get("thumbnail", ""),
+                post_id=post_id,
+            )
+            for digest, (post_id, item) in first_claim.items()
+            if digest not in media_by_hash
+        ]
+        if missing:
+            result.created = _insert_media(missing)
+            created = Media.objects.filter(url_hash__in=[media.url_hash for media in missing]).only(*fields)
+            media_by_hash.update((media.url_hash, media) for media in created)
+
+        # Titles belong to the post the gallery links to; other posts only fill blanks.
+        changed = {}
+        for post_id, by_hash in hashed.items():
+            for digest, item in by_hash.items():
+                media = media_by_hash[digest]
+                if media.post_id is None:
+                    media.post_id = post_id
+                    changed[media.id] = media
+                if (media.post_id == post_id or not media.title) and (media.title, media.media_type) != (
+                    item["title"],
+                    item["media_type"],
+                ):
+                    media.title = item["title"]
+                    media.media_type = item["media_type"]
+                    changed[media.id] = media
+                if not media.thumbnail and item.get("thumbnail"):
+                    media.thumbnail = item["thumbnail"]
+                    changed[media.id] = media
+        if changed:
+            result.updated = Media.objects.bulk_update(
+                list(changed.values()), ["title", "media_type", "thumbnail", "post"]
+            )
+
+        linked = set(links.objects.filter(post_id__in=hashed).values_list("post_id", "media_id"))
+        wanted_links = {
+            (post_id, media_by_hash[digest].id) for post_id, by_hash in hashed.items() for digest in by_hash
+        }
+        added = wanted_links - linked
+        removed = linked - wanted_links
+        if added:
+            links.objects.bulk_create(
+                [links(post_id=post_id, media_id=media_id) for post_id, media_id in added], ignore_conflicts=True
+            )
+            result.linked = len(added)
+        if removed:
+            removed_by_post: dict[int, set[int]] = {}
+            removed_by_media: dict[int, set[int]] = {}
+            for post_id, media_id in removed:
+                removed_by_post.setdefault(post_id, set()).add(media_id)
+                removed_by_media.setdefault(media_id, set()).add(post_id)
+            for post_id, media_ids in removed_by_post.items():
+                result.unlinked += links.objects.filter(post_id=post_id, media_id__in=media_ids).delete()[0]
+            other_posts = dict(links.objects.filter(media_id__in=removed_by_media).values_list("media_id", "post_id"))
+            orphaned = removed_by_media.keys() - other_posts.keys()
+            if orphaned:
+                result.deleted = Media.objects.filter(id__in=orphaned).delete()[1].get(Media._meta.label, 0)
+            for media_id, other_post_id in other_posts.items():
+                Media.objects.filter(id=media_id, post_id__in=removed_by_media[media_id]).update(post_id=other_post_id)
+    if result.changed:
+        bump_cache_version(MEDIA_VERSION)
+    return result
+
+
+def orphaned_media() -> QuerySet[Media]:
+    """Media that no post references: no gallery post and no post link."""
+    links = Media.posts.through.objects.filter(media_id=OuterRef("pk"))
+    return Media.objects.filter(post__isnull=True).filter(~Exists(links))
+
+
+def delete_orphaned_media(
+    batch_size: int = 500,
+    limit: int | None = None,
+    on_batch: Callable[[list[Media]], None] | None = None,
+    after_batch: Callable[[list[Media], int], None] | None = None,
+) -> int:
+    """Delete orphaned media in id order, one short transaction per ``batch_size`` rows.
+
+    ``on_batch`` sees exactly the rows about to be deleted, inside their
+    transaction (e.g. to archive them); rows re-linked since the scan are
+    kept and never reach it. ``after_batch`` gets the same rows and the
+    number deleted once the transaction has committed, so progress output or
+    throttling there does not hold the write lock. Returns the number deleted.
+    """
+    deleted = 0
+    last_id = 0
+    while limit is None or deleted < limit:
+        size = batch_size if limit is None else min(batch_size, limit - deleted)
+        with transaction.atomic():
+            # Locking the candidates stops new links to them; the re-check then
+            # drops any linked before the lock was taken.
+            candidates = list(
+                orphaned_media().filter(id__gt=last_id).order_by("id").select_for_update().values_list("id", flat=True)[:size]
             )
+            if not candidates:
+                break
+            last_id = candidates[-1]
+            batch = list(orphaned_media().filter(id__in=candidates).order_by("id"))
+            if not batch:
+                continue
+            if on_batch is not None:
+                on_batch(batch)
+            count = Media.objects.filter(id__in=[media.id for media in batch]).delete()[1].get(Media._meta.label, 0)
+        deleted += count
+        if after_batch is not None:
+            after_batch(batch, count)
+    if deleted:
+        bump_cache_version(MEDIA_VERSION)
+    return deleted
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Versioned cache keys and media facets
+# ─────────────────────────────────────────────────────────────────────────────
+
+MEDIA_VERSION = "media"
+POSTS_VERSION = "posts"
+VIDEOS_VERSION = "videos"
+FACETS_TIMEOUT = 24 * 60 * 60
+# A per-process cache never sees bumps made by workers and commands; bound how stale it gets.
+FACETS_LOCAL_TIMEOUT = 60
+# Backends whose entries live in one process: a bump made elsewhere never reaches them.
+LOCAL_CACHE_BACKENDS = frozenset(
+    {
+        "django.core.cache.backends.locmem.LocMemCache",
+        "django.core.cache.backends.dummy.DummyCache",
+    }
+)
+
+
+def shared_cache() -> bool:
+    """Whether every process sees the same default cache (Redis, memcached, database, files).
+
+    Workers and management commands bump versions too; only a shared cache
+    carries those bumps to the web processes.
+    """
+    return settings.CACHES["default"]["BACKEND"] not in LOCAL_CACHE_BACKENDS
+
+
+def post_page_version(slug: str) -> str:
+    """Version name of the data shown on one post's detail page."""
+    return f"post:{slug}"
+
+
+def _initial_version() -> int:
+    # Seeded from the clock so a version evicted from the cache never restarts
+    # at a number that older entries were stored under.
+    return time.time_ns() // 1_000_000
+
+
+def cache_version(name: str) -> int:
+    """Current version of a cached data set; cache keys embed it so a bump retires them all."""
+    key = f"portal:version:{name}"
+    version = cache.get(key)
+    if version is None:
+        # add() keeps a concurrent first writer's value; re-read whichever won.
+        cache.add(key, _initial_version(), None)
+        version = cache.get(key, 0)
+    return version
+
+
+def cache_versions(names: Sequence[str]) -> list[int]:
+    """``cache_version`` for several names with one cache round trip when all are set."""
+    keys = [f"portal:version:{name}" for name in names]
+    found = cache.get_many(keys)
+    return [found[key] if key in found else cache_version(name) for key, name in zip(keys, names)]
+
+
+def bump_cache_version(name: str) -> None:
+    key = f"portal:version:{name}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
+
+
+def media_grid_cache_key(template: str, media_type: str, search: str, cursor: str) -> str:
+    """Key of a rendered gallery fragment; ``search`` should already be whitespace-normalised."""
+    if search.isascii():
+        # icontains matches ASCII case-insensitively on every backend
+        search = search.lower()
+    digest = hashlib.sha1("\x00".join((template, media_type, search, cursor)).encode("utf-8")).hexdigest()
+    return f"portal:media-grid:{cache_version(MEDIA_VERSION)}:{digest}"
+
+
+@dataclass
+class MediaFacets:
+    total: int = 0
+    by_type: dict[str, int] = field(default_factory=dict)
+    by_committee: dict[str, int] = field(default_factory=dict)
+
+
+def media_facets() -> MediaFacets:
+    """Media counts per type and per committee of the linked post, from one GROUP BY.
+
+    Committees are counted by ``committee_key``, as ``committee_view`` filters,
+    so spellings of the same committee share one bucket.
+    """
+    key = f"portal:media-facets:{cache_version(MEDIA_VERSION)}"
+    facets = cache.get(key)
+    if facets is not None:
+        return facets
+    facets = MediaFacets()
+    rows = Media.objects.order_by().values_list("media_type", "post__committee_key").annotate(count=Count("id"))
+    for media_type, committee, count in rows:
+        facets.total += count
+        facets.by_type[media_type] = facets.by_type.get(media_type, 0) + count
+        committee = committee or ""
+        facets.by_committee[committee] = facets.by_committee.get(committee, 0) + count
+    cache.set(key, facets, FACETS_TIMEOUT if shared_cache() else FACETS_LOCAL_TIMEOUT)
+    return facets
 
 
 def render_post_content(content: str) -> str:
@@ -394,150 +633,59 @@ def render_post_content(content: str) -> str:
     Render post content from Markdown-like syntax to HTML.
     Supports: headings, bold, italic, underline, code blocks, lists, images, videos, links.
     """
-    # Work with a copy
-    html = content
-    
-    # Escape HTML special chars first (but preserve intentional HTML)
-    # We'll process markdown then allow specific HTML tags
-    
-    # Code blocks (```code```) - preserve and highlight
-    def code_block_replace(match):
-        lang = match.group(1) or ""
-        code = escape(match.group(2))
-        return f'<pre class="code-block bg-sage-100 dark:bg-sage-800 rounded-xl p-4 overflow-x-auto my-4"><code class="text-sm font-mono text-sage-800 dark:text-cream-100" data-lang="{lang}">{code}</code></pre>'
-    
-    html = re.sub(r'```(\w*)\n?([\s\S]*?)```', code_block_replace, html)
-    
-    # Inline code (`code`)
-    html = re.sub(r'`([^`]+)`', r'<code class="bg-sage-100 dark:bg-sage-800 px-2 py-0.5 rounded text-sm font-mono">\1</code>', html)
-    
-    # Headings
-    html = re.sub(r'^### (.+)$', r'<h3 class="text-xl font-serif font-semibold text-sage-800 dark:text-cream-100 mt-6 mb-3">\1</h3>', html, flags=re.MULTILINE)
-    html = re.sub(r'^## (.+)$', r'<h2 class="text-2xl font-serif font-semibold text-sage-800 dark:text-cream-100 mt-8 mb-4">\1</h2>', html, flags=re.MULTILINE)
-    html = re.sub(r'^# (.+)$', r'<h1 class="text-3xl font-serif font-bold text-sage-800 dark:text-cream-100 mt-8 mb-4">\1</h1>', html, flags=re.MULTILINE)
-    
-    # Bold, Italic, Underline
-    html = re.sub(r'\*\*\*(.+?)\*\*\*', r'<strong><em>\1</em></strong>', html)
-    html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
-    html = re.sub(r'__(.+?)__', r'<u>\1</u>', html)
-    html = re.sub(r'\*(.+?)\*', r'<em>\1</em>', html)
-    html = re.sub(r'_(.+?)_', r'<em>\1</em>', html)
-    
-    # Images: ![alt](url)
-    def img_replace(match):
-        alt = match.group(1)
-        url = match.group(2)
-        return f'<figure class="my-6"><img src="{url}" alt="{alt}" class="rounded-2xl shadow-lg max-w-full h-auto mx-auto" loading="lazy">{f"<figcaption class=text-center text-sm text-sage-500 dark:text-sage-400 mt-2>{alt}</figcaption>" if alt else ""}</figure>'
-    
-    html = re.sub(r'!\[([^\]]*)\]\(([^)]+)\)', img_replace, html)
-    
-    # Links: [text](url)
-    html = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2" class="text-sage-600 dark:text-cream-300 underline hover:text-sage-800 dark:hover:text-cream-100 transition-colors">\1</a>', html)
-    
-    # YouTube embeds
-    def youtube_embed(match):
-        video_id = match.group(1)
-        return f'<div class="relative w-full aspect-video my-6"><iframe src="https://www.youtube.com/embed/{video_id}" class="absolute inset-0 w-full h-full rounded-2xl shadow-lg" frameborder="0" allowfullscreen loading="lazy"></iframe></div>'
-    
-    html = re.sub(r'(?:https?://)?(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]+)', youtube_embed, html)
-    
-    # Unordered lists
-    def process_ul(text):
-        lines = text.split('\n')
-        result = []
-        in_list = False
-        for line in lines:
-            if re.match(r'^[\-\*] ', line):
-                if not in_list:
-                    result.append('<ul class="list-disc list-inside space-y-2 my-4 ml-4">')
-                    in_list = True
-                item = re.sub(r'^[\-\*] ', '', line)
-                result.append(f'<li class="text-sage-700 dark:text-cream-200">{item}</li>')
-            else:
-                if in_list:
-                    result.append('</ul>')
-                    in_list = False
-                result.append(line)
-        if in_list:
-            result.append('</ul>')
-        return '\n'.join(result)
-    
-    html = process_ul(html)
-    
-    # Ordered lists
-    def process_ol(text):
-        lines = text.split('\n')
-        result = []
-        in_list = False
-        for line in lines:
-            if re.match(r'^\d+\. ', line):
-                if not in_list:
-                    result.append('<ol class="list-decimal list-inside space-y-2 my-4 ml-4">')
-                    in_list = True
-                item = re.sub(r'^\d+\. ', '', line)
-                result.append(f'<li class="text-sage-700 dark:text-cream-200">{item}</li>')
-            else:
-                if in_list:
-                    result.append('</ol>')
-                    in_list = False
-                result.append(line)
-        if in_list:
-            result.append('</ol>')
-        return '\n'.join(result)
-    
-    html = process_ol(html)
-    
-    # Horizontal rule
-    html = re.sub(r'^---+$', r'<hr class="my-8 border-sage-200 dark:border-sage-700">', html, flags=re.MULTILINE)
-    
-    # Blockquotes
-    def process_blockquotes(text):
-        lines = text.split('\n')
-        result = []
-        in_quote = False
-        for line in lines:
-            if line.startswith('> '):
-                if not in_quote:
-                    result.append('<blockquote class="border-l-4 border-sage-400 dark:border-sage-600 pl-4 py-2 my-4 italic text-sage-600 dark:text-sage-300">')
-                    in_quote = True
-                result.append(line[2:])
-            else:
-                if in_quote:
-                    result.append('</blockquote>')
-                    in_quote = False
-                result.append(line)
-        if in_quote:
-            result.append('</blockquote>')
-        return '\n'.join(result)
-    
-    html = process_blockquotes(html)
-    
-    # Paragraphs - wrap remaining text blocks
-    paragraphs = html.split('\n\n')
-    processed = []
-    for p in paragraphs:
-        p = p.strip()
-        if p and not p.startswith('<'):
-            # Wrap plain text in paragraph tags
-            lines = p.split('\n')
-            wrapped_lines = []
-            for line in lines:
-                if line.strip() and not line.strip().startswith('<'):
-                    wrapped_lines.append(f'<p class="text-sage-700 dark:text-cream-200 leading-relaxed mb-4">{line}</p>')
-                else:
-                    wrapped_lines.append(line)
-            processed.append('\n'.join(wrapped_lines))
-        else:
-            processed.append(p)
-    
-    html = '\n\n'.join(processed)
-    
-    return mark_safe(html)
+    return mark_safe(markup.render(content))
+
+
+def render_preview_content(content: str) -> str:
+    """Render editor preview content, reusing earlier renders of identical drafts and unchanged blocks."""
+    return mark_safe(preview_render_cache.get_or_render(content, render_incremental))
+
+
+RENDERED_CONTENT_FIELDS = list(Post.RENDERED_FIELDS)
+
+
+def rendered_post_content(post: Post) -> str:
+    """Return the stored HTML for ``post``, backfilling rows rendered by an older renderer."""
+    if post.rendered_is_stale:
+        post.refresh_rendered_content(force=True)
+        Post.objects.filter(pk=post.pk).update(
+            **{name: getattr(post, name) for name in RENDERED_CONTENT_FIELDS}
+        )
+    return mark_safe(post.rendered_content)
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def stream_post_content(post: Post, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """Yield the HTML for ``post`` in pieces.
+
+    Stored HTML is sliced into ``chunk_size`` pieces; stale rows are rendered
+    block by block as they are sent and backfilled once the last block is out.
+    """
+    if not post.rendered_is_stale:
+        html = post.rendered_content
+        for start in range(0, len(html), chunk_size):
+            yield html[start:start + chunk_size]
+        return
+
+    parts = []
+    for piece in markup.render_stream(post.content):
+        parts.append(piece)
+        yield piece
+    post.rendered_content = "".join(parts)
+    post.renderer_version = markup.RENDERER_VERSION
+    post.content_hash = markup.content_digest(post.content)
+    Post.objects.filter(pk=post.pk).update(
+        **{name: getattr(post, name) for name in RENDERED_CONTENT_FIELDS}
+    )
 
 
 __all__ = [
     "TaskFilter",
     "TaskSummary",
+    "MediaSyncResult",
+    "MediaFacets",
     "ChatMessageDTO",
     "ChatTaskDTO",
     "ChatTaskItemDTO",
@@ -547,11 +695,26 @@ __all__ = [
     "ensure_system_chat_message",
     "tasks_for_admin",
     "committees_for_context",
+    "post_cards",
     "posts_by_committee",
     "videos_by_category",
     "normalize_committee_key",
     "committee_by_key",
     "extract_media_from_content",
+    "post_media_items",
+    "release_post_media",
+    "orphaned_media",
+    "delete_orphaned_media",
+    "cache_version",
+    "cache_versions",
+    "post_page_version",
+    "bump_cache_version",
+    "media_facets",
+    "media_grid_cache_key",
     "sync_post_media",
+    "sync_posts_media",
     "render_post_content",
+    "render_preview_content",
+    "rendered_post_content",
+    "stream_post_content",
 ]
@@ -0,0 +1,41 @@
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Post, Video
+from .services import POSTS_VERSION, VIDEOS_VERSION, bump_cache_version, post_page_version
+
+
+@receiver([post_save, post_delete], sender=Post, dispatch_uid="portal.post_changed")
+def post_changed(sender, instance: Post, **kwargs) -> None:
+    """Retire cached pages that list posts and the post's own page (under its old slug too)."""
+    bump_cache_version(POSTS_VERSION)
+    loaded_slug = getattr(instance, "_loaded_values", {}).get("slug")
+    for slug in {instance.slug, loaded_slug} - {None, ""}:
+        bump_cache_version(post_page_version(slug))
+
+
+@receiver([post_save, post_delete], sender=Video, dispatch_uid="portal.video_changed")
+def video_changed(sender, instance: Video, **kwargs) -> None:
+    bump_cache_version(VIDEOS_VERSION)
+
+
+RECEIVERS = (
+    (post_changed, Post, "portal.post_changed"),
+    (video_changed, Video, "portal.video_changed"),
+)
+
+
+@contextmanager
+def cache_versions_frozen():
+    """Skip the version bumps above, for saves that are rolled back (e.g. benchmarks)."""
+    for signal in (post_save, post_delete):
+        for handler, sender, uid in RECEIVERS:
+            signal.disconnect(handler, sender=sender, dispatch_uid=uid)
+    try:
+        yield
+    finally:
+        for signal in (post_save, post_delete):
+            for handler, sender, uid in RECEIVERS:
+                signal.connect(handler, sender=sender, dispatch_uid=uid)
@@ -6,14 +6,18 @@ import time
 from functools import wraps
 from typing import Callable
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.core.cache import cache
 from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.http import require_GET, require_http_methods
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.views.decorators.http import condition, require_GET, require_http_methods
 
-from . import services
+from . import jobs, services
 from .forms import (
     ChatMessageForm,
     ChatTaskAssignmentForm,
@@ -27,6 +31,8 @@ from .forms import (
     VideoForm,
 )
 from .models import AccountUser, ChatMessage, ChatTask, ChatTaskItem, Media, Post, Video
+from .page_cache import cache_anonymous_page, versioned_etag
+from .pagination import decode_cursor, keyset_page
 from .services import (
     MAX_CHAT_MESSAGE_LENGTH,
     MAX_TASK_DESCRIPTION_LENGTH,
@@ -128,6 +134,7 @@ def base_context(request: HttpRequest) -> dict:
 
 
 @require_GET
+@cache_anonymous_page(services.POSTS_VERSION, services.VIDEOS_VERSION)
 def home(request: HttpRequest) -> HttpResponse:
     context = base_context(request)
     context["posts"] = posts_by_committee()
@@ -187,24 +194,35 @@ def logout_view(request: HttpRequest) -> HttpResponse:
 
 @login_required
 @require_GET
+@condition(etag_func=versioned_etag(services.POSTS_VERSION))
 def posts_list(request: HttpRequest) -> HttpResponse:
     context = base_context(request)
-    posts = Post.objects.all()
+    # Seek on (date, id), the same order as Post.Meta.ordering.
+    cursor = decode_cursor(request.GET.get("cursor", ""))
+    page = keyset_page(services.post_cards(), cursor, settings.POSTS_PAGE_SIZE, key=("date", "id"))
+    context["posts"] = page.items
+    context["next_cursor"] = page.next_cursor
     
-    # Handle htmx partial loading
+    # Handle htmx partial loading: the next page for infinite scroll, or the first page
     if is_htmx(request):
-        return render(request, "posts/partials/post_list.html", {"posts": posts, **context})
+        return render(request, "posts/partials/post_list.html", context)
     
-    context["posts"] = posts
     return render(request, "posts/list.html", context)
 
 
 @require_GET
+@condition(etag_func=versioned_etag(services.post_page_version("{slug}")))
+@cache_anonymous_page(services.post_page_version("{slug}"))
 def post_detail(request: HttpRequest, slug: str) -> HttpResponse:
     post = get_object_or_404(Post, slug=slug)
     context = base_context(request)
     context["post"] = post
-    context["rendered_content"] = services.render_post_content(post.content)
+
+    # Large posts stream: the page shell goes out first, the body block by block.
+    if not is_htmx(request) and len(post.content) >= settings.POST_STREAM_MIN_LENGTH:
+        return _stream_post_detail(request, post, context)
+
+    context["rendered_content"] = services.rendered_post_content(post)
     
     # Handle htmx partial loading
     if is_htmx(request):
@@ -213,6 +231,23 @@ def post_detail(request: HttpRequest, slug: str) -> HttpResponse:
     return render(request, "posts/detail.html", context)
 
 
+POST_CONTENT_SLOT = "<!--post-content-slot-->"
+
+
+def _stream_post_detail(request: HttpRequest, post: Post, context: dict) -> StreamingHttpResponse:
+    # Head and tail are rendered up front so template side effects (CSRF cookie,
+    # consumed messages) happen before the middleware sees the response.
+    context["rendered_content"] = mark_safe(POST_CONTENT_SLOT)
+    head, _, tail = render_to_string("posts/detail.html", context, request=request).partition(POST_CONTENT_SLOT)
+
+    def page():
+        yield head
+        yield from services.stream_post_content(post)
+        yield tail
+
+    return StreamingHttpResponse(page(), content_type="text/html; charset=utf-8")
+
+
 @media_publisher_required
 @require_http_methods(["GET", "POST"])
 def create_post(request: HttpRequest) -> HttpResponse:
@@ -221,9 +256,9 @@ def create_post(request: HttpRequest) -> HttpResponse:
         if form.is_valid():
             post = form.save(commit=False)
             post.committee = services.normalize_committee_key(post.committee)
-            post.save()
-            # Extract and save media from content
-            services.sync_post_media(post)
+            # Excerpt, stored HTML and media are derived by a background job
+            post.save(derive=False)
+            jobs.enqueue_post_derivation(post)
             messages.success(request, "Post created")
             if is_htmx(request):
                 response = HttpResponse(status=204)
@@ -246,9 +281,13 @@ def edit_post(request: HttpRequest, pk: int) -> HttpResponse:
         if form.is_valid():
             updated = form.save(commit=False)
             updated.committee = services.normalize_committee_key(updated.committee)
-            updated.save()
-            # Re-sync media from updated content
-            services.sync_post_media(updated)
+            updated.save(derive=False)
+            if updated.saved_fields & {"committee", "title"}:
+                # Facets group by the linked post's committee; grid cards show its title and link
+                services.bump_cache_version(services.MEDIA_VERSION)
+            # Re-derive only when the content, thumbnail or title changed
+            if updated.saved_fields & Post.MEDIA_SOURCE_FIELDS or not updated.excerpt:
+                jobs.enqueue_post_derivation(updated)
             messages.success(request, "Post updated")
             if is_htmx(request):
                 response = HttpResponse(status=204)
@@ -267,6 +306,7 @@ def edit_post(request: HttpRequest, pk: int) -> HttpResponse:
 @require_http_methods(["POST"])
 def delete_post(request: HttpRequest, pk: int) -> HttpResponse:
     post = get_object_or_404(Post, pk=pk)
+    services.release_post_media(post)
     post.delete()
     messages.success(request, "Post deleted")
     return redirect("posts")
@@ -274,9 +314,9 @@ def delete_post(request: HttpRequest, pk: int) -> HttpResponse:
 
 @login_required
 @require_GET
+@condition(etag_func=versioned_etag(services.VIDEOS_VERSION))
 def videos_list(request: HttpRequest) -> HttpResponse:
     context = base_context(request)
-    context["posts"] = posts_by_committee()
     context["videos"] = videos_by_category()
     return render(request, "videos/list.html", context)
 
@@ -325,6 +365,7 @@ def delete_video(request: HttpRequest, pk: int) -> HttpResponse:
 
 
 @require_GET
+@cache_anonymous_page()
 def legacy_view(request: HttpRequest) -> HttpResponse:
     context = base_context(request)
     return render(request, "legacy.html", context)
@@ -334,30 +375,60 @@ def legacy_view(request: HttpRequest) -> HttpResponse:
 # Media Gallery Views
 # ─────────────────────────────────────────────────────────────────────────────
 
+MEDIA_PAGE_SIZE = 24
+
+
 @login_required
 @require_GET
+@condition(etag_func=versioned_etag(services.MEDIA_VERSION))
 def media_list(request: HttpRequest) -> HttpResponse:
     """Media gallery page with htmx filtering"""
-    context = base_context(request)
-    media_type = request.GET.get("media_type", "")
-    search = request.GET.get("search", "")
+    # A cursor carries the filters it was issued for, so later pages stay consistent.
+    cursor_token = request.GET.get("cursor", "")
+    cursor = decode_cursor(cursor_token)
+    filters = cursor or request.GET
+    media_type = str(filters.get("media_type", ""))
+    search = " ".join(str(filters.get("search", "")).split())
+    template = "media/partials/media_page.html" if cursor else "media/partials/media_grid.html"
+
+    # The grid fragment holds no per-user state, so it is shared until media changes. Only a
+    # cache shared by every process sees the media version bumps made by workers and commands.
+    cache_key = None
+    grid_html = None
+    if services.shared_cache():
+        cache_key = services.media_grid_cache_key(template, media_type, search, cursor_token if cursor else "")
+        grid_html = cache.get(cache_key)
+    if grid_html is None:
+        media_qs = Media.objects.select_related("post").only(*services.MEDIA_CARD_FIELDS)
+        
+        if media_type:
+            media_qs = media_qs.filter(media_type=media_type)
+        if search:
+            media_qs = media_qs.filter(title__icontains=search)
+        
+        page = keyset_page(media_qs, cursor, MEDIA_PAGE_SIZE, extra={"media_type": media_type, "search": search})
+        grid_html = render_to_string(
+            template,
+            {
+                "media_items": page.items,
+                "next_cursor": page.next_cursor,
+                "current_filter": media_type,
+                "current_search": search,
+            },
+        )
+        if cache_key:
+            cache.set(cache_key, grid_html, settings.MEDIA_GRID_CACHE_TIMEOUT)
     
-    media_qs = Media.objects.select_related("post")
-    
-    if media_type:
-        media_qs = media_qs.filter(media_type=media_type)
-    if search:
-        media_qs = media_qs.filter(title__icontains=search)
+    # Handle htmx partial loading: next page for infinite scroll, whole grid for filtering
+    if is_htmx(request):
+        return HttpResponse(grid_html)
     
-    context["media_items"] = media_qs
+    context = base_context(request)
+    context["media_grid"] = mark_safe(grid_html)
     context["filter_form"] = MediaFilterForm(initial={"media_type": media_type, "search": search})
     context["current_filter"] = media_type
     context["current_search"] = search
-    
-    # Handle htmx partial loading for filtering
-    if is_htmx(request):
-        return render(request, "media/partials/media_grid.html", context)
-    
+    context["facets"] = services.media_facets()
     return render(request, "media/list.html", context)
 
 
@@ -371,25 +442,32 @@ def post_editor_help(request: HttpRequest) -> HttpResponse:
 def preview_post_content(request: HttpRequest) -> HttpResponse:
     """Preview rendered post content via htmx"""
     content = request.POST.get("content", "")
-    rendered = services.render_post_content(content)
+    if len(content) > settings.POST_CONTENT_MAX_LENGTH:
+        return HttpResponse("Content is too long to preview.", status=413)
+    rendered = services.render_preview_content(content)
     return HttpResponse(rendered)
 
 
 @require_GET
+@cache_anonymous_page(services.POSTS_VERSION)
 def committee_view(request: HttpRequest, key: str) -> HttpResponse:
     committee = services.committee_by_key(key)
     if not committee:
         return HttpResponse(status=404)
-    posts = posts_by_committee()["Posts"]
-    filtered = [post for post in posts if services.normalize_committee_key(post.committee) == committee.key]
+    cursor = decode_cursor(request.GET.get("cursor", ""))
+    posts = services.post_cards(Post.objects.filter(committee_key=committee.key))
+    page = keyset_page(posts, cursor, settings.POSTS_PAGE_SIZE, key=("date", "id"))
     context = base_context(request)
     context.update(
         {
             "committee": committee,
-            "committee_posts": filtered,
-            "posts": {"Posts": posts},
+            "committee_posts": page.items,
+            "next_cursor": page.next_cursor,
         }
     )
+    # Infinite scroll asks for the next page only
+    if is_htmx(request) and cursor:
+        return render(request, "committees/partials/post_page.html", context)
     return render(request, "committees/detail.html", context)
 
 
@@ -0,0 +1,34 @@
+// Click-to-load video facades (see portal/markup.py and templates/includes/video_facade.html).
+// A facade is a thumbnail linking to the video page; clicking it swaps in the player
+// iframe. With VIDEO_EMBED_MODE=iframe every facade is upgraded as soon as it appears.
+(function () {
+    function load(facade, autoplay) {
+        var src = facade.dataset.embedSrc;
+        if (!src) return;
+        var iframe = document.createElement('iframe');
+        iframe.src = autoplay ? src + (src.indexOf('?') === -1 ? '?' : '&') + 'autoplay=1' : src;
+        iframe.className = 'absolute inset-0 w-full h-full rounded-2xl shadow-lg';
+        iframe.title = facade.dataset.title || 'Video player';
+        iframe.allow = 'accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture';
+        iframe.setAttribute('frameborder', '0');
+        iframe.setAttribute('allowfullscreen', '');
+        facade.removeAttribute('data-embed-src');
+        facade.replaceChildren(iframe);
+    }
+
+    function upgradeAll(root) {
+        if (document.body.dataset.videoEmbed !== 'iframe') return;
+        root.querySelectorAll('.video-facade[data-embed-src]').forEach(function (facade) {
+            load(facade, false);
+        });
+    }
+
+    document.addEventListener('click', function (event) {
+        var link = event.target.closest('.video-facade .video-facade-play');
+        if (!link || event.button !== 0 || event.metaKey || event.ctrlKey || event.shiftKey || event.altKey) return;
+        event.preventDefault();
+        load(link.closest('.video-facade'), true);
+    });
+    document.addEventListener('DOMContentLoaded', function () { upgradeAll(document); });
+    document.addEventListener('htmx:load', function (event) { upgradeAll(event.target); });
+})();
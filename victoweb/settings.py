@@ -42,6 +42,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "portal.context_processors.site_settings",
             ],
         },
     }
@@ -57,6 +58,38 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", "victoweb"),
+    }
+}
+
+# Post preview renders: kept in a per-process LRU, optionally shared through a CACHES alias.
+RENDER_CACHE_MAX_BYTES = int(os.getenv("RENDER_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+RENDER_CACHE_ALIAS = os.getenv("RENDER_CACHE_ALIAS", "")
+RENDER_CACHE_TIMEOUT = int(os.getenv("RENDER_CACHE_TIMEOUT", "3600"))
+RENDER_BLOCK_CACHE_MAX_BYTES = int(os.getenv("RENDER_BLOCK_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+# Rendered gallery fragments; keys embed the media version, so edits retire them immediately.
+# Only used with a CACHES backend shared by every process (see PAGE_CACHE_ENABLED).
+MEDIA_GRID_CACHE_TIMEOUT = int(os.getenv("MEDIA_GRID_CACHE_TIMEOUT", "600"))
+# Cards per page on the blog index; later pages load as the reader scrolls.
+POSTS_PAGE_SIZE = int(os.getenv("POSTS_PAGE_SIZE", "12"))
+# Anonymous GETs of public pages are served from CACHES; saves and deletes retire them via version keys.
+# Workers and commands bump those versions too, so this needs a CACHES backend shared by every
+# process (Redis, memcached, database). Unset means on exactly when CACHES is shared; "1" with
+# LocMemCache fails `manage.py check`.
+PAGE_CACHE_ENABLED = {"1": True, "0": False}.get(os.getenv("PAGE_CACHE_ENABLED", ""))
+PAGE_CACHE_TIMEOUT = int(os.getenv("PAGE_CACHE_TIMEOUT", "3600"))
+# Upper bound on post content accepted by the editor and preview; rendering cost is linear in it.
+POST_CONTENT_MAX_LENGTH = int(os.getenv("POST_CONTENT_MAX_LENGTH", "200000"))
+# Post-save derivations run in `manage.py run_workers`; inline mode runs them in the request (dev/tests).
+JOBS_RUN_INLINE = os.getenv("JOBS_RUN_INLINE", "1" if DEBUG else "0") == "1"
+# Posts at least this long are sent with a streaming response instead of one buffered page.
+POST_STREAM_MIN_LENGTH = int(os.getenv("POST_STREAM_MIN_LENGTH", "65536"))
+# "facade" shows a thumbnail and loads the video player on click; "iframe" loads players with the page.
+VIDEO_EMBED_MODE = os.getenv("VIDEO_EMBED_MODE", "facade")
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},